@@ -0,0 +1,120 @@
+"""
+Benchmark of the LDA and NMF topic backends.
+
+Generates a synthetic corpus with planted topics (or loads tokenized comments from
+a JSON file), fits both backends on the same bag-of-words, and reports fit time
+and u_mass topic coherence (higher is better).
+
+Usage (from backend/):
+    python -m benchmarks.topic_backends --docs 2000 --repeats 3
+    python -m benchmarks.topic_backends --corpus tokenized_comments.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from gensim import corpora, models
+from gensim.models.coherencemodel import CoherenceModel
+
+from src.preprocessing.vocabulary import build_vocabulary
+from src.topic_modeling.nmf import fit_nmf_topics
+
+# Same settings as the ETL pipeline
+NUM_TOPICS = 10
+LDA_PASSES = 5
+NMF_MAX_ITER = 200
+TOPN = 10
+
+
+# ---------------------------------------
+# Corpus
+# ---------------------------------------
+def synthetic_corpus(num_docs: int, num_topics=NUM_TOPICS, words_per_topic=30, doc_length=15,
+                     noise=0.2, seed=42) -> List[List[str]]:
+    """Generates documents that each mostly draw from one planted topic's vocabulary."""
+    rng = random.Random(seed)
+    topics = [[f"t{t}w{w}" for w in range(words_per_topic)] for t in range(num_topics)]
+    shared = [f"common{w}" for w in range(words_per_topic)]
+
+    docs = []
+    for _ in range(num_docs):
+        topic = rng.choice(topics)
+        docs.append([rng.choice(shared) if rng.random() < noise else rng.choice(topic) for _ in range(doc_length)])
+    return docs
+
+
+def load_corpus(path: str) -> List[List[str]]:
+    """Loads a JSON list of token lists."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------------------------------------
+# Backends
+# ---------------------------------------
+def fit_lda(corpus, dictionary) -> np.ndarray:
+    return models.LdaModel(corpus=corpus, num_topics=NUM_TOPICS, id2word=dictionary,
+                           passes=LDA_PASSES, random_state=42).get_topics()
+
+
+def fit_nmf(corpus, dictionary) -> np.ndarray:
+    return fit_nmf_topics(corpus, len(dictionary), num_topics=NUM_TOPICS, max_iter=NMF_MAX_ITER)
+
+
+BACKENDS: Dict[str, Callable] = {"lda": fit_lda, "nmf": fit_nmf}
+
+
+# ---------------------------------------
+# Benchmark
+# ---------------------------------------
+def top_words(topic_term_matrix: np.ndarray, dictionary, topn=TOPN) -> List[List[str]]:
+    """Returns the top-N words of every topic."""
+    order = np.argsort(-topic_term_matrix, axis=1)[:, :topn]
+    return [[dictionary[int(i)] for i in row] for row in order]
+
+
+def run_benchmark(docs: List[List[str]], repeats=3) -> Dict[str, Dict]:
+    """Times each backend and scores its topics with u_mass coherence."""
+    dictionary, _ = build_vocabulary(docs, no_below=2, no_above=0.5, keep_n=10000)
+    corpus = [dictionary.doc2bow(doc) for doc in docs]
+
+    report = {}
+    for name, fit in BACKENDS.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            topic_term_matrix = fit(corpus, dictionary)
+            timings.append(time.perf_counter() - start)
+
+        topics = top_words(topic_term_matrix, dictionary)
+        coherence = CoherenceModel(topics=topics, corpus=corpus, dictionary=dictionary,
+                                   coherence="u_mass").get_coherence()
+        report[name] = {
+            "median_seconds": round(statistics.median(timings), 4),
+            "min_seconds": round(min(timings), 4),
+            "u_mass_coherence": round(float(coherence), 4),
+            "topics": [" ".join(words[:5]) for words in topics],
+        }
+
+    report["speedup_nmf_vs_lda"] = round(report["lda"]["median_seconds"] / max(report["nmf"]["median_seconds"], 1e-9), 2)
+    report["corpus"] = {"documents": len(docs), "terms": len(dictionary)}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare LDA and NMF topic backends")
+    parser.add_argument("--docs", type=int, default=2000, help="Number of synthetic documents")
+    parser.add_argument("--corpus", help="JSON file with a list of token lists (overrides --docs)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed fits per backend")
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.docs)
+    print(json.dumps(run_benchmark(docs, repeats=args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+# Words used to synthesize comment text
+VOCABULARY = (
+    "great video love audio sound music funny bad editing tutorial quality mic "
+    "content boring amazing helpful lighting volume creative hate awesome thanks"
+).split()
+
+PAGE_SIZE = 100
+
+
+def parse_video_size(video_id: str) -> int:
+    """
+    Reads the number of comments a fake video has from its ID.
+
+    Load-test video IDs look like `lt_<comments>_<index>`; anything else gets 100 comments.
+    """
+    parts = video_id.split("_")
+    if len(parts) == 3 and parts[0] == "lt" and parts[1].isdigit():
+        return int(parts[1])
+    return PAGE_SIZE
+
+
+def build_page(video_id: str, offset: int) -> dict:
+    """Builds one deterministic commentThreads page starting at `offset`."""
+    total = parse_video_size(video_id)
+    rng = random.Random(f"{video_id}:{offset}")
+    published = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    items = []
+    for i in range(offset, min(offset + PAGE_SIZE, total)):
+        items.append({"id": f"{video_id}_{i}", "snippet": {"topLevelComment": {"snippet": {
+            "textDisplay": " ".join(rng.choices(VOCABULARY, k=rng.randint(3, 20))),
+            "authorDisplayName": f"user{i}",
+            "likeCount": rng.randint(0, 50),
+            "publishedAt": (published + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }}}})
+
+    page = {"kind": "youtube#commentThreadListResponse", "items": items}
+    if offset + PAGE_SIZE < total:
+        page["nextPageToken"] = str(offset + PAGE_SIZE)
+    return page
+
+
+def create_fake_youtube_app(page_latency: float = 0.0) -> web.Application:
+    """
+    Creates an aiohttp app that mimics the commentThreads endpoint.
+
+    :param page_latency: Seconds of simulated network/API latency per page.
+    """
+    async def comment_threads(request: web.Request) -> web.Response:
+        if page_latency:
+            await asyncio.sleep(page_latency)
+        video_id = request.query.get("videoId", "")
+        offset = int(request.query.get("pageToken") or 0)
+        return web.json_response(build_page(video_id, offset))
+
+    app = web.Application()
+    app.router.add_get("/youtube/v3/commentThreads", comment_threads)
+    return app
+
+
+async def start_fake_youtube(host: str = "127.0.0.1", port: int = 0, page_latency: float = 0.0):
+    """
+    Starts the fake YouTube API server.
+
+    :return: (runner, url of the commentThreads endpoint); call `await runner.cleanup()` to stop it.
+    """
+    runner = web.AppRunner(create_fake_youtube_app(page_latency))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/youtube/v3/commentThreads"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a fake YouTube commentThreads API for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--page-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"Serving fake commentThreads at http://{args.host}:{args.port}/youtube/v3/commentThreads")
+    web.run_app(create_fake_youtube_app(args.page_latency_ms / 1000), host=args.host, port=args.port)
@@ -0,0 +1,314 @@
+"""
+Load-testing harness for the FastAPI service.
+
+Drives concurrent /run-etl traffic against the real ASGI app, backed by a fake
+YouTube API, and reports throughput, latency percentiles, error rate, event-loop
+lag and CPU usage.
+
+Usage (from backend/):
+    # In-process: the app and a fake YouTube server run inside this process
+    python -m loadtest.run_loadtest loadtest/scenarios/typical.json
+
+    # Over localhost against a running server started with
+    #   YOUTUBE_API_URL=http://127.0.0.1:8081/youtube/v3/commentThreads MAX_COMMENTS=10000 uvicorn src.api:app
+    # (MAX_COMMENTS must cover the largest video size of the scenario)
+    # and a fake backend started with `python -m loadtest.fake_youtube`
+    python -m loadtest.run_loadtest loadtest/scenarios/typical.json \
+        --base-url http://127.0.0.1:8000 --worker-pids 1234 1235
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from loadtest.fake_youtube import start_fake_youtube
+
+# Defaults for optional scenario fields
+SCENARIO_DEFAULTS = {
+    "arrival_rate": 1.0,         # requests per second (Poisson arrivals)
+    "duration": 30,              # seconds of traffic generation
+    "video_sizes": {"100": 1.0}, # comment count -> share of new videos
+    "repeat_ratio": 0.0,         # probability of re-requesting an already requested video
+    "page_latency_ms": 50,       # simulated YouTube API latency per page
+    "request_timeout": 60,       # client-side timeout per request
+    "seed": 42,
+    "max_comments": None,        # per-video comment cap of the app (defaults to the largest video size)
+}
+
+# Interval of the event-loop lag probe
+LAG_PROBE_INTERVAL = 0.05
+
+
+# ---------------------------------------
+# Scenario & Traffic Generation
+# ---------------------------------------
+def load_scenario(path: str) -> Dict:
+    """Loads a scenario JSON file and fills in defaults."""
+    with open(path, "r", encoding="utf-8") as f:
+        scenario = {**SCENARIO_DEFAULTS, **json.load(f)}
+    scenario.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return scenario
+
+
+def comment_cap(scenario: Dict) -> int:
+    """Comment cap the app needs so every video size in the mix is analyzed in full."""
+    return scenario["max_comments"] or max(int(size) for size in scenario["video_sizes"])
+
+
+def pick_video(rng: random.Random, scenario: Dict, requested: List[str]) -> str:
+    """Picks the next video: a repeat with probability `repeat_ratio`, otherwise a new video of a sampled size."""
+    if requested and rng.random() < scenario["repeat_ratio"]:
+        return rng.choice(requested)
+
+    sizes = list(scenario["video_sizes"].keys())
+    weights = list(scenario["video_sizes"].values())
+    video_id = f"lt_{rng.choices(sizes, weights=weights)[0]}_{len(requested)}"
+    requested.append(video_id)
+    return video_id
+
+
+# ---------------------------------------
+# Measurements
+# ---------------------------------------
+class EventLoopLagMonitor:
+    """Measures how late a periodic sleep wakes up, i.e. how long the event loop was blocked."""
+
+    def __init__(self, interval: float = LAG_PROBE_INTERVAL):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._probe())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def read_cpu_seconds(pid: int) -> float:
+    """Returns user + system CPU seconds consumed by a process (Linux /proc)."""
+    if pid == os.getpid():
+        times = os.times()
+        return times.user + times.system
+    with open(f"/proc/{pid}/stat", "r") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(results: List[Dict], elapsed: float, lags: Optional[List[float]], cpu: Dict[int, float]) -> Dict:
+    """Builds the report from per-request results."""
+    latencies = [r["latency"] * 1000 for r in results]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r["error"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+    report = {
+        "requests": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies, default=0.0), 1),
+        },
+        "error_rate": round(sum(errors.values()) / len(results), 4) if results else 0.0,
+        "errors": errors,
+        "cpu": {
+            str(pid): {"cpu_seconds": round(seconds, 3), "utilization": round(seconds / elapsed, 3) if elapsed else 0.0}
+            for pid, seconds in cpu.items()
+        },
+    }
+    if lags is not None:
+        lags_ms = [lag * 1000 for lag in lags]
+        report["event_loop_lag_ms"] = {
+            "p50": round(percentile(lags_ms, 50), 1),
+            "p99": round(percentile(lags_ms, 99), 1),
+            "max": round(max(lags_ms, default=0.0), 1),
+        }
+    return report
+
+
+# ---------------------------------------
+# Runner
+# ---------------------------------------
+async def send_request(client: httpx.AsyncClient, video_id: str, results: List[Dict]) -> None:
+    started = time.perf_counter()
+    error = None
+    try:
+        response = await client.get("/run-etl", params={"videoLink": f"https://www.youtube.com/watch?v={video_id}"})
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}"
+        elif response.json().get("status") != "Success":
+            error = response.json().get("status", "unknown")
+    except Exception as e:
+        error = type(e).__name__
+    results.append({"video_id": video_id, "latency": time.perf_counter() - started, "error": error})
+
+
+async def generate_traffic(client: httpx.AsyncClient, scenario: Dict) -> List[Dict]:
+    """Sends open-loop Poisson traffic for the scenario duration and waits for all responses."""
+    rng = random.Random(scenario["seed"])
+    requested: List[str] = []
+    results: List[Dict] = []
+    tasks = []
+
+    deadline = time.perf_counter() + scenario["duration"]
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        tasks.append(asyncio.create_task(send_request(client, pick_video(rng, scenario, requested), results)))
+        next_arrival += rng.expovariate(scenario["arrival_rate"])
+
+    await asyncio.gather(*tasks)
+    return results
+
+
+# ---------------------------------------
+# In-Process App Isolation
+# ---------------------------------------
+@contextmanager
+def scenario_environment(overrides: Dict[str, str]) -> Iterator[None]:
+    """Sets environment variables for the run and restores the previous values afterwards."""
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def isolated_stores(data_dir: str) -> Iterator[None]:
+    """
+    Points the app's shared history, trend and comment index stores at `data_dir`,
+    so load-test analyses never reach the developer's real databases (even if
+    src.config was imported before the run), and restores them afterwards.
+    """
+    from src.storage import analysis_store, comment_index
+    from src.trends import rollups
+
+    db_path = os.path.join(data_dir, "analysis.db")
+    swaps = [
+        (analysis_store, "_analysis_store", analysis_store.AnalysisStore(db_path)),
+        (rollups, "_rollup_store", rollups.TrendRollupStore(db_path)),
+        (comment_index, "_comment_index_store", comment_index.CommentIndexStore(os.path.join(data_dir, "comment_index"))),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name, _ in swaps]
+    for module, name, store in swaps:
+        setattr(module, name, store)
+    try:
+        yield
+    finally:
+        for module, name, store in saved:
+            setattr(module, name, store)
+
+
+async def run_scenario(scenario: Dict, base_url: Optional[str] = None, worker_pids: Optional[List[int]] = None) -> Dict:
+    """
+    Runs one scenario and returns the report.
+
+    :param base_url: Target server; None runs the app in-process against a fake YouTube server.
+    :param worker_pids: Server worker PIDs whose CPU usage is reported (defaults to this process in-process).
+    """
+    timeout = httpx.Timeout(scenario["request_timeout"])
+    fake_youtube = None
+    lag_monitor = None
+    isolation = ExitStack()
+
+    if base_url is None:
+        fake_youtube, api_url = await start_fake_youtube(page_latency=scenario["page_latency_ms"] / 1000)
+        data_dir = isolation.enter_context(tempfile.TemporaryDirectory(prefix="loadtest-"))
+        overrides = {
+            "YOUTUBE_API_URL": api_url,
+            "MAX_COMMENTS": str(comment_cap(scenario)),
+            "ANALYSIS_DB_PATH": os.path.join(data_dir, "analysis.db"),
+            "COMMENT_INDEX_DIR": os.path.join(data_dir, "comment_index"),
+        }
+        for name in ("YOUTUBE_API_KEY", "MY_AWS_ACCESS_KEY_ID", "MY_AWS_SECRET_KEY", "MY_AWS_REGION"):
+            overrides[name] = os.environ.get(name, "loadtest")
+        isolation.enter_context(scenario_environment(overrides))
+        from src.api import app  # imported late so the app picks up the fake API URL and comment cap
+        isolation.enter_context(isolated_stores(data_dir))
+
+        worker_pids = worker_pids or [os.getpid()]
+        lag_monitor = EventLoopLagMonitor()
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout)
+    else:
+        worker_pids = worker_pids or []
+        client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+    cpu_before = {pid: read_cpu_seconds(pid) for pid in worker_pids}
+    started = time.perf_counter()
+    try:
+        if lag_monitor:
+            lag_monitor.start()
+        results = await generate_traffic(client, scenario)
+        elapsed = time.perf_counter() - started
+    finally:
+        if lag_monitor:
+            await lag_monitor.stop()
+        await client.aclose()
+        if fake_youtube is not None:
+            await lifespan.__aexit__(None, None, None)
+            await fake_youtube.cleanup()
+        isolation.close()
+
+    cpu = {pid: read_cpu_seconds(pid) - cpu_before[pid] for pid in worker_pids}
+    report = summarize(results, elapsed, lag_monitor.lags if lag_monitor else None, cpu)
+    report["scenario"] = scenario["name"]
+    report["mode"] = "in-process" if base_url is None else base_url
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the /run-etl endpoint.")
+    parser.add_argument("scenario", help="Path to a scenario JSON file")
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--worker-pids", type=int, nargs="*", help="Server worker PIDs to report CPU usage for")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_scenario(load_scenario(args.scenario), args.base_url, args.worker_pids))
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from src.main import run_etl_pipeline, extract_video_id
+from src.main import run_etl_pipeline, extract_video_id, normalize_query_term
+from src.config import YOUTUBE_API_URL
+from src.extraction.http_client import http_client
+from src.trends.rollups import get_rollup_store, GRANULARITIES
+from src.utils.profiling import RequestProfiler, should_profile
+from src.storage.analysis_store import get_analysis_store
+from src.storage.comment_index import get_comment_index_store
+from src.topic_modeling.topics import TOPIC_BACKENDS
+from src.utils.http_responses import cacheable_json_response
 import asyncio
 import logging
+from contextlib import asynccontextmanager, nullcontext
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Opens the pooled YouTube HTTP client for the app's lifetime."""
+    await http_client.start(warm_up_url=YOUTUBE_API_URL)
+    yield
+    await http_client.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for frontend communication
 app.add_middleware(
@@ -16,7 +32,10 @@ app.add_middleware(
 )
 
 @app.get("/run-etl")
-async def run_etl(videoLink: str = Query(..., title="YouTube Video Link")):
+async def run_etl(request: Request,
+                  videoLink: str = Query(..., title="YouTube Video Link"),
+                  profile: bool = Query(False, title="Profile this run (requires PROFILING_ENABLED)"),
+                  topicBackend: str = Query(None, title="Topic model backend (lda or nmf)")):
     """API endpoint to trigger the ETL pipeline."""
     
     logging.info(f"Received videoLink: {videoLink}")
@@ -27,11 +46,112 @@ async def run_etl(videoLink: str = Query(..., title="YouTube Video Link")):
         logging.error("Invalid video link provided.")
         return {"status": "Invalid video link"}
 
+    if topicBackend is not None and topicBackend.lower() not in TOPIC_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported topic backend: {topicBackend}")
+
+    # Opt-in profiling of this run
+    profiler = None
+    profile_requested = profile or request.headers.get("X-Profile") == "1"
+    if should_profile(profile_requested):
+        profiler = RequestProfiler(video_id)
+
     try:
         # Run the ETL pipeline
-        result = await run_etl_pipeline(video_id)  # Now returning a dictionary
+        with profiler or nullcontext():
+            result = await run_etl_pipeline(video_id, topic_backend=topicBackend)  # Now returning a dictionary
+        # Sampled runs stay invisible to the caller; explicit requests get the file names only
+        if profiler is not None and profile_requested:
+            result["profile"] = profiler.file_names()
         logging.info(f"ETL Pipeline Response: {result}")
 
-        return result  # ✅ Directly return the dictionary
+        cacheable = result.get("status") == "Success" and not result.get("partial") and "profile" not in result
+        return cacheable_json_response(request, result, cacheable=cacheable)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/trends")
+async def get_trends(videoLink: str = Query(..., title="YouTube Video Link"),
+                     granularity: str = Query("hour", title="Bucket size (hour or day)")):
+    """API endpoint returning the time-bucketed sentiment trend of a previously analyzed video."""
+
+    video_id = extract_video_id(videoLink)
+    if not video_id:
+        logging.error("Invalid video link provided.")
+        return {"status": "Invalid video link"}
+
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported granularity: {granularity}")
+
+    return {
+        "status": "Success",
+        "video_id": video_id,
+        "granularity": granularity,
+        "buckets": await asyncio.to_thread(get_rollup_store().get_trend, video_id, granularity)
+    }
+
+
+@app.get("/history/latest")
+async def history_latest(channelId: str = Query(None, title="Restrict to one channel"),
+                         limit: int = Query(50, ge=1, le=500)):
+    """Latest stored analysis of every video (optionally within a channel), most recent first."""
+    runs = await asyncio.to_thread(get_analysis_store().latest_per_video, channelId, limit)
+    return {"status": "Success", "runs": runs}
+
+
+@app.get("/history/video")
+async def history_video(videoLink: str = Query(..., title="YouTube Video Link"),
+                        limit: int = Query(50, ge=1, le=500)):
+    """All stored analyses of one video, most recent first."""
+    video_id = extract_video_id(videoLink)
+    if not video_id:
+        logging.error("Invalid video link provided.")
+        return {"status": "Invalid video link"}
+
+    runs = await asyncio.to_thread(get_analysis_store().video_history, video_id, limit)
+    return {"status": "Success", "video_id": video_id, "runs": runs}
+
+
+@app.get("/history/channel/top-terms")
+async def history_channel_top_terms(channelId: str = Query(..., title="YouTube Channel ID"),
+                                    limit: int = Query(20, ge=1, le=500)):
+    """Highest-weighted topic terms across the latest analyses of a channel's videos."""
+    terms = await asyncio.to_thread(get_analysis_store().top_terms_for_channel, channelId, limit)
+    return {"status": "Success", "channel_id": channelId, "terms": terms}
+
+
+@app.get("/comments")
+async def indexed_comments(videoLink: str = Query(..., title="YouTube Video Link"),
+                           order: str = Query("asc", pattern="^(asc|desc)$",
+                                              title="asc for most negative first, desc for most positive first"),
+                           label: str = Query(None, pattern="(?i)^(positive|negative|neutral|mixed)$"),
+                           term: str = Query(None, title="Only comments containing this word"),
+                           offset: int = Query(0, ge=0),
+                           limit: int = Query(20, ge=1, le=200)):
+    """Paginated per-comment results of a video's latest analysis, sorted by sentiment score."""
+    video_id = extract_video_id(videoLink)
+    if not video_id:
+        logging.error("Invalid video link provided.")
+        return {"status": "Invalid video link"}
+
+    try:
+        index = await asyncio.to_thread(get_comment_index_store().get, video_id)
+    except ValueError:
+        logging.error(f"Invalid video ID for the comment index: {video_id}")
+        return {"status": "Invalid video link"}
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"No indexed comments for video ID: {video_id}")
+
+    # Match the normalization applied to the indexed tokens
+    if term is not None:
+        term = normalize_query_term(term)
+    page = index.query(order=order, label=label.upper() if label else None, term=term, offset=offset, limit=limit)
+
+    next_offset = offset + limit if offset + limit < page["total"] else None
+    return {"status": "Success", "video_id": video_id, "offset": offset, "limit": limit,
+            "next_offset": next_offset, **page}
+
+
+@app.get("/metrics/http-client")
+async def http_client_metrics():
+    """Connection-reuse and pool-wait metrics of the pooled YouTube HTTP client."""
+    return http_client.get_metrics()
@@ -23,7 +23,57 @@ API_KEY = os.getenv('YOUTUBE_API_KEY')
 AWS_ACCESS_KEY_ID = os.getenv('MY_AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.getenv('MY_AWS_SECRET_KEY')
 AWS_REGION = os.getenv('MY_AWS_REGION')
-YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3/commentThreads"
+YOUTUBE_API_URL = os.getenv('YOUTUBE_API_URL', "https://www.googleapis.com/youtube/v3/commentThreads")
+
+# Maximum number of comments fetched per video (100 per API page)
+MAX_COMMENTS = int(os.getenv('MAX_COMMENTS', '100'))
+
+# On-disk cache of YouTube API pages: "off", "revalidate" (conditional requests) or "replay" (offline)
+HTTP_CACHE_MODE = os.getenv('HTTP_CACHE_MODE', 'off').lower()
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', str(Path(__file__).parent.parent / '.http_cache'))
+
+# Pooled HTTP client for the YouTube API
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '20'))
+HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '60'))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '15'))
+HTTP_TOTAL_TIMEOUT = float(os.getenv('HTTP_TOTAL_TIMEOUT', '30'))
+
+# Latency budget for a single pipeline run, kept below the API Gateway/Lambda timeout
+PIPELINE_DEADLINE_SECONDS = float(os.getenv('PIPELINE_DEADLINE_SECONDS', '25'))
+
+# Maximum number of candidate terms tracked while building the topic model vocabulary
+VOCAB_SKETCH_CAPACITY = int(os.getenv('VOCAB_SKETCH_CAPACITY', '50000'))
+
+# SQLite database keeping the history of analysis results (only /tmp is writable on Lambda)
+ANALYSIS_DB_PATH = os.getenv(
+    'ANALYSIS_DB_PATH',
+    str(Path(__file__).parent.parent / '.data' / 'analysis.db') if ENV == "dev" else '/tmp/analysis.db'
+)
+
+# Directory of the per-comment result indexes, and how many are kept in memory
+COMMENT_INDEX_DIR = os.getenv('COMMENT_INDEX_DIR', str(Path(ANALYSIS_DB_PATH).parent / 'comment_index'))
+COMMENT_INDEX_CACHE_SIZE = int(os.getenv('COMMENT_INDEX_CACHE_SIZE', '32'))
+
+# Seconds clients and CDNs may cache a complete /run-etl result
+RESULT_CACHE_MAX_AGE = int(os.getenv('RESULT_CACHE_MAX_AGE', '300'))
+
+# Topic model backend: "lda" (gensim LdaModel) or "nmf" (sparse TF-IDF + multiplicative-update NMF)
+TOPIC_BACKEND = os.getenv('TOPIC_BACKEND', 'lda').lower()
+NMF_MAX_ITER = int(os.getenv('NMF_MAX_ITER', '200'))
+
+# Number of videos analyzed concurrently by the batch Lambda handler. CPU stages run in
+# worker threads, so one video's fetch overlaps another's analysis; pure-Python stages
+# (tokenization, VADER) still share the GIL and do not speed up with more concurrency
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+
+# Opt-in per-request profiling: honoured for requests asking for it (X-Profile header or
+# `profile` parameter) only when enabled; a sample rate > 0 also profiles random requests
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_OUTPUT_DIR = os.getenv('PROFILING_OUTPUT_DIR', '/tmp/profiles')
 
 # Validate environment variables
 if not all([API_KEY, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION]):
@@ -1,11 +1,20 @@
+import asyncio
 import aiohttp
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
-from src.config import YOUTUBE_API_URL, API_KEY
+import orjson
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from src.config import YOUTUBE_API_URL, API_KEY, HTTP_CACHE_MODE, HTTP_CACHE_DIR
+from src.extraction.http_cache import HttpPageCache, CacheMissError
+from src.extraction.http_client import http_client
+from src.utils.deadline import FETCH_MIN_REMAINING
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(min=1, max=10), reraise=True)
+# Shared on-disk page cache (None when HTTP_CACHE_MODE is "off")
+page_cache = HttpPageCache(HTTP_CACHE_DIR, HTTP_CACHE_MODE) if HTTP_CACHE_MODE != "off" else None
+
+@retry(stop=stop_after_attempt(5), wait=wait_exponential(min=1, max=10), reraise=True,
+       retry=retry_if_not_exception_type(CacheMissError))
 async def fetch_comments_page(session, video_id, page_token=None):
-    """Fetches a page of comments from YouTube API asynchronously."""
+    """Fetches a page of comments from YouTube API asynchronously, going through the page cache if enabled."""
     params = {
         'part': 'snippet',
         'videoId': video_id,
@@ -16,37 +25,84 @@ async def fetch_comments_page(session, video_id, page_token=None):
     if page_token:
         params['pageToken'] = page_token
 
-    async with session.get(YOUTUBE_API_URL, params=params) as response:
+    cache_key, cached = None, None
+    if page_cache is not None:
+        cache_key = page_cache.make_key(params)
+        cached = await asyncio.to_thread(page_cache.load, cache_key)
+        if page_cache.mode == "replay":
+            if cached is None:
+                raise CacheMissError(f"No recorded page for video ID {video_id} (pageToken={page_token})")
+            return orjson.loads(cached['body'])
+
+    headers = HttpPageCache.conditional_headers(cached)
+    async with session.get(YOUTUBE_API_URL, params=params, headers=headers) as response:
+        if response.status == 304 and cached is not None:
+            logging.debug(f"Cached page still valid for video ID {video_id} (pageToken={page_token})")
+            return orjson.loads(cached['body'])
         if response.status == 200:
-            return await response.json()
+            body = await response.read()
+            if page_cache is not None:
+                await asyncio.to_thread(page_cache.store, cache_key, params, body, dict(response.headers))
+            return orjson.loads(body)
         else:
             logging.error(f"Failed to fetch comments page: HTTP {response.status}")
             response.raise_for_status()
 
-async def get_detailed_comments(video_id, max_results=100):
-    """Fetches detailed comments from a YouTube video asynchronously with pagination and retry logic."""
+async def get_detailed_comments(video_id, max_results=100, deadline=None, session=None):
+    """
+    Fetches detailed comments from a YouTube video asynchronously with pagination and retry logic.
+
+    If a Deadline is given, pagination stops early once the fetch share of the budget is spent.
+    Without an explicit session, the app-wide pooled client is used when it has been started
+    on this loop; otherwise a session is opened for this call.
+    """
+    if session is None and http_client.started:
+        session = http_client.session
+    if session is None:
+        async with aiohttp.ClientSession() as owned_session:
+            return await get_detailed_comments(video_id, max_results, deadline, owned_session)
+
     comments = []
-    async with aiohttp.ClientSession() as session:
-        next_page_token = None
-        while len(comments) < max_results:
-            try:
-                response = await fetch_comments_page(session, video_id, next_page_token)
-                if 'error' in response:
-                    logging.error(f"Error in response: {response['error']['message']}")
-                    break
-                for item in response.get('items', []):
-                    comment_data = item['snippet']['topLevelComment']['snippet']
-                    comments.append({
-                        'text': comment_data['textDisplay']
-                        # 'author': comment_data['authorDisplayName'],
-                        # 'likes': comment_data['likeCount'],
-                        # 'published_at': comment_data['publishedAt']
-                    })
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token:
+    next_page_token = None
+    while len(comments) < max_results:
+        try:
+            if deadline is not None:
+                fetch_budget = deadline.remaining() - deadline.budget * FETCH_MIN_REMAINING
+                if fetch_budget <= 0:
+                    deadline.degrade("fetch", f"stopped after {len(comments)} comments")
                     break
-            except Exception as e:
-                logging.error(f"Error fetching comments: {e}")
+                response = await asyncio.wait_for(
+                    fetch_comments_page(session, video_id, next_page_token), timeout=fetch_budget
+                )
+            else:
+                response = await fetch_comments_page(session, video_id, next_page_token)
+            if 'error' in response:
+                logging.error(f"Error in response: {response['error']['message']}")
+                break
+            for item in response.get('items', []):
+                comment_data = item['snippet']['topLevelComment']['snippet']
+                comments.append({
+                    'comment_id': item.get('id'),
+                    'text': comment_data['textDisplay'],
+                    'author': comment_data.get('authorDisplayName'),
+                    'likes': int(comment_data.get('likeCount', 0)),
+                    'published_at': comment_data.get('publishedAt'),
+                    'channel_id': item['snippet'].get('channelId')
+                })
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
                 break
-        logging.info(f"Fetched {len(comments)} comments from video ID: {video_id}")
+        except asyncio.TimeoutError:
+            if deadline is None:
+                logging.error("Timed out fetching comments")
+            else:
+                deadline.degrade("fetch", f"page request timed out after {len(comments)} comments")
+            break
+        except CacheMissError:
+            # Replay mode must fail fast instead of returning a silently truncated run
+            raise
+        except Exception as e:
+            logging.error(f"Error fetching comments: {e}")
+            break
+    logging.info(f"Fetched {len(comments)} comments from video ID: {video_id}")
     return comments
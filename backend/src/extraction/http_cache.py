@@ -0,0 +1,100 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Supported cache modes
+CACHE_MODES = {"off", "revalidate", "replay"}
+
+# Request parameters that never take part in the cache key
+EXCLUDED_PARAMS = {"key"}
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a requested page was never recorded."""
+
+
+# ---------------------------------------
+# On-Disk Page Cache
+# ---------------------------------------
+class HttpPageCache:
+    """
+    On-disk cache of YouTube API response pages.
+
+    Entries are keyed by the request parameters minus the API key and hold the
+    gzip-compressed response body together with its ETag/Last-Modified validators.
+
+    Modes:
+      - "revalidate": serve cached pages after a conditional request (304 -> cached body).
+      - "replay": serve cached pages only and never touch the network.
+    """
+
+    def __init__(self, cache_dir: str, mode: str = "revalidate"):
+        if mode not in CACHE_MODES - {"off"}:
+            raise ValueError(f"Unsupported cache mode: {mode}")
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        """Builds a stable cache key from request parameters, ignoring the API key."""
+        keyed = {k: v for k, v in params.items() if k not in EXCLUDED_PARAMS and v is not None}
+        return hashlib.sha256(json.dumps(keyed, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def load(self, key: str) -> Optional[Dict]:
+        """
+        Loads a cached entry.
+
+        :return: dict with 'body' (bytes), 'etag', 'last_modified' and 'stored_at', or None on a miss.
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rb") as f:
+                entry = json.loads(f.read())
+            entry["body"] = entry["body"].encode("utf-8")
+            return entry
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def store(self, key: str, params: Dict, body: bytes, headers: Dict) -> None:
+        """Stores a response body with its validators, replacing any previous entry atomically."""
+        entry = {
+            "params": {k: v for k, v in params.items() if k not in EXCLUDED_PARAMS},
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": body.decode("utf-8"),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Builds If-None-Match / If-Modified-Since headers for revalidating a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
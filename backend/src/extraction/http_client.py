@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import aiohttp
+import orjson
+from yarl import URL
+
+from src.config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class PooledHttpClient:
+    """
+    Long-lived aiohttp client shared by every analysis in the process.
+
+    Keeps connections to the YouTube API alive between analyses, caches DNS lookups,
+    caps connections per host and records connection-reuse and pool-wait metrics
+    through aiohttp tracing. The session is bound to the event loop it was started on.
+    """
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "connection_setup_seconds": 0.0,
+            "pool_waits": 0,
+            "pool_wait_seconds": 0.0,
+            "pool_wait_seconds_max": 0.0,
+        }
+
+    @property
+    def started(self) -> bool:
+        """Whether the client is open and usable from the running event loop."""
+        if self.session is None or self.session.closed:
+            return False
+        try:
+            return self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def start(self, warm_up_url: Optional[str] = None) -> aiohttp.ClientSession:
+        """
+        Opens the pooled session on the running loop.
+
+        :param warm_up_url: If given, a HEAD request is sent to the root of this URL's
+                            host so the first analysis finds an established TLS
+                            connection in the pool (the API endpoint itself is not called).
+        """
+        if self.started:
+            return self.session
+
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            sock_connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._trace_config()],
+            json_serialize=lambda obj: orjson.dumps(obj).decode("utf-8"),
+        )
+        self._loop = asyncio.get_running_loop()
+        logging.info(f"Started pooled HTTP client (limit={HTTP_POOL_LIMIT}, per host={HTTP_POOL_LIMIT_PER_HOST})")
+
+        if warm_up_url:
+            await self.warm_up(warm_up_url)
+        return self.session
+
+    async def warm_up(self, url: str) -> None:
+        """
+        Opens a keep-alive connection to `url`'s host with a HEAD request to the host
+        root, so no API quota is spent; failures are only logged.
+        """
+        origin = URL(url).origin()
+        try:
+            async with self.session.head(origin, allow_redirects=False) as response:
+                await response.read()
+            logging.info(f"Warmed up connection pool for {origin}")
+        except Exception as e:
+            logging.warning(f"Connection pool warm-up failed for {origin}: {e}")
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._loop = None
+
+    def get_metrics(self) -> Dict:
+        """Returns request, connection-reuse and pool-wait counters."""
+        metrics = dict(self._metrics)
+        connections = metrics["connections_created"] + metrics["connections_reused"]
+        metrics["reuse_ratio"] = round(metrics["connections_reused"] / connections, 4) if connections else 0.0
+        metrics["pool_limit"] = HTTP_POOL_LIMIT
+        metrics["pool_limit_per_host"] = HTTP_POOL_LIMIT_PER_HOST
+        metrics["started"] = self.session is not None and not self.session.closed
+        return metrics
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        metrics = self._metrics
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            metrics["requests"] += 1
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, ctx, params):
+            waited = time.perf_counter() - ctx.queued_at
+            metrics["pool_waits"] += 1
+            metrics["pool_wait_seconds"] += waited
+            metrics["pool_wait_seconds_max"] = max(metrics["pool_wait_seconds_max"], waited)
+
+        async def on_create_start(session, ctx, params):
+            ctx.connect_started_at = time.perf_counter()
+
+        async def on_create_end(session, ctx, params):
+            metrics["connections_created"] += 1
+            metrics["connection_setup_seconds"] += time.perf_counter() - ctx.connect_started_at
+
+        async def on_reuse(session, ctx, params):
+            metrics["connections_reused"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_start.append(on_create_start)
+        trace_config.on_connection_create_end.append(on_create_end)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+
+# Shared client used by the API lifespan and the warm Lambda container
+http_client = PooledHttpClient()
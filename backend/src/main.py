@@ -1,20 +1,48 @@
 import logging
 import asyncio
+import json
 import re
+from contextlib import nullcontext
 from urllib.parse import urlparse, parse_qs
 
+import numpy as np
+import pandas as pd
+
 # Gensim & NLTK
-from gensim import corpora, models
+from gensim import models
 from nltk.tokenize import word_tokenize
 
 # Local Modules
 from src.extraction.fetch_comments import get_detailed_comments
-from src.preprocessing.preprocessing import preprocess_comments
+from src.preprocessing.preprocessing import (
+    prefilter_comments, preprocess_comments, clean_raw_text, tokenize_remove_stopwords_lemmatize
+)
+from src.preprocessing.vocabulary import build_vocabulary
 from src.sentiment_analysis.sentiment_analysis import analyze_sentiment
+from src.trends.rollups import get_rollup_store
+from src.storage.analysis_store import get_analysis_store
+from src.storage.comment_index import CommentIndex, get_comment_index_store
+from src.config import (
+    PIPELINE_DEADLINE_SECONDS, BATCH_CONCURRENCY, YOUTUBE_API_URL, TOPIC_BACKEND, NMF_MAX_ITER, MAX_COMMENTS
+)
+from src.topic_modeling.nmf import fit_nmf_topics
+from src.topic_modeling.topics import TOPIC_BACKENDS, assign_topics, assign_lda_topics
+from src.extraction.http_client import http_client
+from src.utils.profiling import RequestProfiler, mark_stage, should_profile
+from src.utils.deadline import (
+    Deadline,
+    BIGRAMS_MIN_REMAINING,
+    TOPICS_FULL_MIN_REMAINING,
+    SUGGESTIONS_MIN_REMAINING
+)
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Fail at startup on a misconfigured backend rather than silently running LDA
+if TOPIC_BACKEND not in TOPIC_BACKENDS:
+    raise ValueError(f"Unsupported TOPIC_BACKEND: {TOPIC_BACKEND}")
+
 # ---------------------------------------------------------------------
 # 1) STOPWORDS & SYNONYMS
 # ---------------------------------------------------------------------
@@ -72,53 +100,100 @@ def unify_synonyms(tokens):
     """
     return [SYNONYM_MAP.get(t, t) for t in tokens]
 
+
+def normalize_query_term(term: str) -> str:
+    """
+    Normalizes a search term the way comment tokens are normalized before indexing
+    (cleaning, lemmatization, synonym unification), e.g. "Videos" -> "video".
+    Multi-word terms are joined with "_" to match bigram tokens.
+    """
+    cleaned = clean_raw_text(pd.Series([term.replace("_", " ")])).iloc[0]
+    tokens = unify_synonyms(tokenize_remove_stopwords_lemmatize(cleaned))
+    return unify_synonyms(["_".join(tokens)])[0] if tokens else term.strip().lower()
+
 # ---------------------------------------------------------------------
 # 4) TOPIC EXTRACTION & FORMATTING
 # ---------------------------------------------------------------------
-def extract_words_from_topics(topics, max_words=10):
+SENTIMENT_CATEGORIES = ["positive", "negative", "neutral", "mixed"]
+
+
+def build_vocabulary_masks(id2word):
     """
-    Extracts and cleans LDA topic words, ensuring that each word has an associated weight.
-    
-    :param topics: list of raw topic strings from LDA.
-    :param max_words: how many words to take from each raw topic.
-    :return: dict with words and weights:
+    Precomputes per-vocabulary-ID lookups so topic post-processing works on
+    term IDs instead of re-parsing and re-looking-up individual strings.
+
+    :param id2word: gensim Dictionary (or any mapping of contiguous IDs -> token).
+    :return: dict with:
         {
-            "positive": {"word1": weight, "word2": weight, ...},
-            "negative": {"word1": weight, ...},
-            "neutral": {"word1": weight, ...},
-            "mixed": {"word1": weight, ...}
+            "words": array of synonym-unified words indexed by term ID,
+            "stopword": boolean mask of term IDs whose unified word is a custom stopword,
+            "suggestion": int array of indices into SUGGESTIONS_MAP keys (-1 if none)
         }
     """
-    cleaned_topics = {
-        "positive": {},
-        "negative": {},
-        "neutral": {},
-        "mixed": {}
+    vocab_size = len(id2word)
+    raw_words = [id2word[token_id] for token_id in range(vocab_size)]
+    words = np.array([SYNONYM_MAP.get(w, w) for w in raw_words], dtype=object)
+
+    suggestion_index = {keyword: i for i, keyword in enumerate(SUGGESTIONS_MAP)}
+
+    return {
+        "words": words,
+        "stopword": np.fromiter((w in CUSTOM_STOPWORDS for w in words), dtype=bool, count=vocab_size),
+        "suggestion": np.fromiter((suggestion_index.get(w, -1) for w in raw_words), dtype=np.int64, count=vocab_size),
     }
 
-    for i, topic in enumerate(topics):
-        # Extract words and weights
-        word_weight_pairs = re.findall(r'([\d.]+)\*"(.*?)"', topic.lower())
 
-        if not word_weight_pairs:
-            continue
+def top_topic_terms(topic_term_matrix, topn=10):
+    """
+    Selects the `topn` highest-weighted terms of every topic via array partitioning.
 
-        sentiment_category = list(cleaned_topics.keys())[i % 4]  # Cycle through categories
+    :param topic_term_matrix: array of shape (num_topics, vocab_size), e.g. LdaModel.get_topics().
+    :param topn: number of terms to keep per topic.
+    :return: (term_ids, weights), both of shape (num_topics, topn), sorted by descending weight.
+    """
+    topic_term_matrix = np.asarray(topic_term_matrix)
+    topn = min(topn, topic_term_matrix.shape[1])
+    if topn <= 0:
+        empty = np.empty((topic_term_matrix.shape[0], 0))
+        return empty.astype(np.int64), empty
 
-        for weight, word in word_weight_pairs[:max_words]:
-            weight = float(weight)  # Convert weight from string to float
-            word = SYNONYM_MAP.get(word, word)  # Replace synonyms
+    term_ids = np.argpartition(-topic_term_matrix, topn - 1, axis=1)[:, :topn]
+    weights = np.take_along_axis(topic_term_matrix, term_ids, axis=1)
 
-            if word in CUSTOM_STOPWORDS:
-                continue  # Skip stopwords
+    order = np.argsort(-weights, axis=1, kind="stable")
+    return np.take_along_axis(term_ids, order, axis=1), np.take_along_axis(weights, order, axis=1)
 
-            # normalized_weight = max(1, round(weight * 100))  # Ensure positive integer weights
 
-            normalized_weight = max(10, round(weight * 10000))  # Increase base weight for visibility
+def extract_words_from_topics(topic_term_matrix, vocab_masks, max_words=10):
+    """
+    Extracts and cleans topic words, ensuring that each word has an associated weight.
 
+    :param topic_term_matrix: array of shape (num_topics, vocab_size) with per-topic term weights.
+    :param vocab_masks: output of build_vocabulary_masks() for the model's dictionary.
+    :param max_words: how many words to take from each topic.
+    :return: dict with words and weights:
+        {
+            "positive": {"word1": weight, "word2": weight, ...},
+            "negative": {"word1": weight, ...},
+            "neutral": {"word1": weight, ...},
+            "mixed": {"word1": weight, ...}
+        }
+    """
+    cleaned_topics = {category: {} for category in SENTIMENT_CATEGORIES}
 
-            # ✅ Store as a dictionary instead of a list
-            cleaned_topics[sentiment_category][word] = normalized_weight
+    term_ids, weights = top_topic_terms(topic_term_matrix, max_words)
+
+    # Skip stopwords and empty terms for all topics at once
+    keep = ~vocab_masks["stopword"][term_ids] & (weights > 0)
+    normalized_weights = np.maximum(10, np.rint(weights * 10000)).astype(np.int64)  # Increase base weight for visibility
+    words = vocab_masks["words"][term_ids]
+
+    for i in range(term_ids.shape[0]):
+        sentiment_category = SENTIMENT_CATEGORIES[i % 4]  # Cycle through categories
+        row_keep = keep[i]
+        cleaned_topics[sentiment_category].update(
+            zip(words[i][row_keep].tolist(), normalized_weights[i][row_keep].tolist())
+        )
 
     return cleaned_topics
 
@@ -126,52 +201,53 @@ def extract_words_from_topics(topics, max_words=10):
 # ---------------------------------------------------------------------
 # 5) CONTENT SUGGESTIONS
 # ---------------------------------------------------------------------
-def generate_content_suggestions(topics):
+SUGGESTIONS_MAP = {
+    # Improvement suggestions
+    "audio": "Consider improving your microphone setup or sound quality.",
+    "sound": "Enhancing sound quality can boost viewer engagement.",
+    "mic": "Your microphone quality might need improvement.",
+    "volume": "Ensure consistent volume levels in your video.",
+    "editing": "Shorter cuts or dynamic transitions might help.",
+    "lighting": "Better lighting can improve video quality.",
+    "quality": "Improving resolution or stability can boost satisfaction.",
+    "length": "Adjust video length based on audience retention.",
+    "clarity": "Clearer visuals or audio can make content more accessible.",
+    "speed": "Adjust pacing to retain viewers.",
+    "engagement": "Encourage comments, likes, and shares.",
+    "content": "Diversify your content for sustained interest.",
+    "presentation": "Refine your presentation style (tone, pacing, clarity).",
+    "graphics": "Use dynamic visuals to enhance storytelling.",
+
+    # Expansion suggestions
+    "funny": "Viewers enjoy your humor! Maybe add more comedic segments.",
+    "tutorial": "People want more step-by-step guides or how-tos.",
+    "collab": "Collaborate with other creators for fresh perspectives.",
+    "music": "Your music choices resonate with viewers. Keep it up!",
+    "engaging": "Your audience likes to engage—ask questions or run polls.",
+    "creative": "Your creativity stands out. Explore new formats or ideas.",
+    "informative": "Viewers value your info. Consider deeper dives.",
+    "relatable": "Personal stories or anecdotes can strengthen connection.",
+    "motivating": "Inspiration works! Include more motivational content.",
+    "interactive": "Interactive content (challenges, Q&A) is a hit."
+}
+SUGGESTION_MESSAGES = list(SUGGESTIONS_MAP.values())
+
+
+def generate_content_suggestions(topic_term_matrix, vocab_masks, topn=10):
     """
     Generates content suggestions based on topic modeling results.
-    Looks for keywords in the raw LDA topics and returns improvement or expansion ideas.
-    """
-    suggestions_map = {
-        # Improvement suggestions
-        "audio": "Consider improving your microphone setup or sound quality.",
-        "sound": "Enhancing sound quality can boost viewer engagement.",
-        "mic": "Your microphone quality might need improvement.",
-        "volume": "Ensure consistent volume levels in your video.",
-        "editing": "Shorter cuts or dynamic transitions might help.",
-        "lighting": "Better lighting can improve video quality.",
-        "quality": "Improving resolution or stability can boost satisfaction.",
-        "length": "Adjust video length based on audience retention.",
-        "clarity": "Clearer visuals or audio can make content more accessible.",
-        "speed": "Adjust pacing to retain viewers.",
-        "engagement": "Encourage comments, likes, and shares.",
-        "content": "Diversify your content for sustained interest.",
-        "presentation": "Refine your presentation style (tone, pacing, clarity).",
-        "graphics": "Use dynamic visuals to enhance storytelling.",
-
-        # Expansion suggestions
-        "funny": "Viewers enjoy your humor! Maybe add more comedic segments.",
-        "tutorial": "People want more step-by-step guides or how-tos.",
-        "collab": "Collaborate with other creators for fresh perspectives.",
-        "music": "Your music choices resonate with viewers. Keep it up!",
-        "engaging": "Your audience likes to engage—ask questions or run polls.",
-        "creative": "Your creativity stands out. Explore new formats or ideas.",
-        "informative": "Viewers value your info. Consider deeper dives.",
-        "relatable": "Personal stories or anecdotes can strengthen connection.",
-        "motivating": "Inspiration works! Include more motivational content.",
-        "interactive": "Interactive content (challenges, Q&A) is a hit."
-    }
+    Looks for keywords among the top terms of each topic and returns improvement or expansion ideas.
 
-    suggestions = set()
+    :param topic_term_matrix: array of shape (num_topics, vocab_size) with per-topic term weights.
+    :param vocab_masks: output of build_vocabulary_masks() for the model's dictionary.
+    :param topn: how many top terms of each topic are searched for keywords.
+    """
+    term_ids, _ = top_topic_terms(topic_term_matrix, topn)
 
-    for topic in topics:
-        # Extract words from each topic using regex
-        words_in_topic = re.findall(r'"(.*?)"', topic.lower())
-        # Check if any known keywords are present
-        for w in words_in_topic:
-            if w in suggestions_map:
-                suggestions.add(suggestions_map[w])
+    hits = vocab_masks["suggestion"][term_ids]
+    hits = np.unique(hits[hits >= 0])
 
-    return list(suggestions)
+    return [SUGGESTION_MESSAGES[i] for i in hits.tolist()]
 
 # ---------------------------------------------------------------------
 # 6) EXECUTIVE SUMMARY
@@ -230,40 +306,129 @@ def generate_executive_summary(sentiment_counts, topics_dict, content_suggestion
 # ---------------------------------------------------------------------
 # 7) MAIN ETL PIPELINE
 # ---------------------------------------------------------------------
-async def run_etl_pipeline(video_id: str) -> dict:
+def _early_result(deadline: Deadline, status: str, **fields) -> dict:
+    """
+    Builds the result of a run that stopped before the summary, keeping the deadline
+    flags so a run cut short (e.g. a fetch that returned nothing in time) is not
+    mistaken for a video that really has no comments.
+    """
+    return {"status": status, **fields, "partial": deadline.partial, "degraded_stages": deadline.degraded_stages}
+
+
+def _tokenize_comments(texts) -> list:
+    """Tokenizes cleaned comments, unifies synonyms and drops custom stopwords."""
+    tokenized_comments = []
+    for text in texts:
+        tokens = word_tokenize(text.lower())
+        tokens = unify_synonyms(tokens)
+        # remove custom stopwords
+        tokens = [t for t in tokens if t not in CUSTOM_STOPWORDS]
+        tokenized_comments.append(tokens)
+    return tokenized_comments
+
+
+def _fit_topic_model(tokenized_comments, topic_backend: str, passes: int, nmf_iter: int, keep_n: int):
+    """
+    Builds the vocabulary and fits the topic model (CPU-bound; run off the event loop).
+
+    :return: (dictionary, vocabulary report, topic-term matrix, dominant topic per comment);
+             the matrix and topics are None when the vocabulary is empty.
+    """
+    # Bounded-memory vocabulary: remove extremely rare or overly common tokens
+    dictionary, vocabulary_report = build_vocabulary(tokenized_comments, no_below=2, no_above=0.5, keep_n=keep_n)
+    if len(dictionary) == 0:
+        return dictionary, vocabulary_report, None, None
+
+    corpus = [dictionary.doc2bow(doc) for doc in tokenized_comments]
+    if topic_backend == "nmf":
+        topic_term_matrix = fit_nmf_topics(corpus, len(dictionary), num_topics=10, max_iter=nmf_iter)
+        comment_topics = assign_topics(corpus, topic_term_matrix)
+    else:
+        lda_model = models.LdaModel(
+            corpus=corpus,
+            num_topics=10,
+            id2word=dictionary,
+            passes=passes,
+            random_state=42
+        )
+        topic_term_matrix = lda_model.get_topics()
+        comment_topics = assign_lda_topics(lda_model, corpus)
+    return dictionary, vocabulary_report, topic_term_matrix, comment_topics
+
+
+async def run_etl_pipeline(video_id: str, *, deadline: Deadline = None, session=None, topic_backend: str = None,
+                           max_comments: int = None) -> dict:
     """
     Executes the full ETL pipeline for YouTube comment sentiment analysis.
 
+    The run is bounded by `deadline` (PIPELINE_DEADLINE_SECONDS by default). When
+    the budget runs low, pagination stops early, LDA uses fewer passes and a smaller
+    vocabulary, and optional stages (bigrams, suggestions) are skipped; the result
+    is then flagged as partial and lists the degraded stages. The CPU-bound stages
+    run in worker threads so the event loop stays responsive, and the deadline is
+    checked again after each of them: once it has expired the remaining stages are
+    skipped and the partial result is returned.
+
+    `session` is an optional long-lived aiohttp session used to fetch comments, and
+    `topic_backend` ("lda" or "nmf") overrides the configured TOPIC_BACKEND, and
+    `max_comments` overrides the configured MAX_COMMENTS cap.
+
     Steps:
       1) Fetch comments
-      2) Preprocess
+      2) Prefilter non-informative comments & preprocess
       3) Analyze sentiment
       4) Tokenize & unify synonyms
-      5) LDA topic modeling
+      5) Topic modeling (LDA or NMF)
       6) Word extraction for frontend
       7) Content suggestions
       8) Executive summary
+      9) Store the result in the analysis history
+      10) Index per-comment results
     """
+    topic_backend = (topic_backend or TOPIC_BACKEND).lower()
+    if topic_backend not in TOPIC_BACKENDS:
+        raise ValueError(f"Unsupported topic backend: {topic_backend}")
+    if deadline is None:
+        deadline = Deadline(PIPELINE_DEADLINE_SECONDS)
+
     try:
         logging.info(f"Starting ETL pipeline for video ID: {video_id}")
 
         # 1. Fetch comments
-        comments = await get_detailed_comments(video_id)
+        mark_stage("fetch")
+        comments = await get_detailed_comments(
+            video_id, max_results=max_comments or MAX_COMMENTS, deadline=deadline, session=session
+        )
         if not comments:
             logging.warning(f"No comments found for video ID: {video_id}")
-            return {"status": "No comments found"}
+            return _early_result(deadline, "No comments found")
+
+        channel_id = comments[0].get("channel_id") if isinstance(comments[0], dict) else None
 
-        # 2. Preprocess comments
-        df_comments = preprocess_comments([{'text': c} for c in comments])
+        # 2. Drop comments that cannot yield a single token, then preprocess
+        mark_stage("preprocess")
+        comments, filtered_counts = prefilter_comments(comments)
+        if not comments:
+            logging.warning("No informative comments left after prefiltering.")
+            return _early_result(deadline, "No valid comments to preprocess", filtered_comments=filtered_counts)
+
+        use_bigrams = deadline.allows(BIGRAMS_MIN_REMAINING)
+        if not use_bigrams:
+            deadline.degrade("bigrams", "skipped bigram detection")
+        df_comments = await asyncio.to_thread(preprocess_comments, comments, use_bigrams=use_bigrams)
         if df_comments.empty:
             logging.warning("No valid comments to preprocess.")
-            return {"status": "No valid comments to preprocess"}
+            return _early_result(deadline, "No valid comments to preprocess")
+        if deadline.expired():
+            deadline.degrade("sentiment", "deadline expired after preprocessing")
+            return _early_result(deadline, "Deadline exceeded", filtered_comments=filtered_counts)
 
         # 3. Analyze sentiment
-        sentiment_results = analyze_sentiment(df_comments["clean_text"].tolist())
+        mark_stage("sentiment")
+        sentiment_results = await asyncio.to_thread(analyze_sentiment, df_comments["clean_text"].tolist())
         if not sentiment_results:
             logging.warning("No sentiment analysis results available.")
-            return {"status": "No sentiment analysis results"}
+            return _early_result(deadline, "No sentiment analysis results")
 
         # 4. Compute sentiment breakdown
         sentiment_counts = {
@@ -273,64 +438,252 @@ async def run_etl_pipeline(video_id: str) -> dict:
             "mixed": sum(1 for r in sentiment_results if r["sentiment"] == "MIXED")
         }
 
+        # Fold new comments into the time-bucketed trend rollups
+        mark_stage("trends")
+        if {"comment_id", "published_at"} <= set(df_comments.columns):
+            try:
+                await asyncio.to_thread(
+                    get_rollup_store().ingest,
+                    video_id,
+                    df_comments["comment_id"].tolist(),
+                    df_comments["published_at"].tolist(),
+                    df_comments["likes"].tolist() if "likes" in df_comments.columns else [0] * len(df_comments),
+                    [r["sentiment"] for r in sentiment_results],
+                    [r["sentiment_score"].get("compound", 0.0) for r in sentiment_results]
+                )
+            except Exception as e:
+                logging.error(f"Failed to update trend rollups for video ID {video_id}: {e}", exc_info=True)
+
         # 5. Tokenize & unify synonyms
+        mark_stage("tokenize")
         tokenized_comments = []
-        for text in df_comments["clean_text"]:
-            tokens = word_tokenize(text.lower())
-            tokens = unify_synonyms(tokens)
-            # remove custom stopwords
-            tokens = [t for t in tokens if t not in CUSTOM_STOPWORDS]
-            tokenized_comments.append(tokens)
-
-        # 6. LDA Topic Modeling
-        dictionary = corpora.Dictionary(tokenized_comments)
-        # remove extremely rare or overly common tokens
-        dictionary.filter_extremes(no_below=2, no_above=0.5, keep_n=10000)
-
-        corpus = [dictionary.doc2bow(doc) for doc in tokenized_comments]
-        lda_model = models.LdaModel(
-            corpus=corpus,
-            num_topics=10,
-            id2word=dictionary,
-            passes=5,
-            random_state=42
-        )
-        top_topics = [lda_model.print_topic(i) for i in range(10)]
-
-        # 7. Word extraction for the frontend
-        formatted_topics = extract_words_from_topics(top_topics)
-
-        # 8. Generate content suggestions
-        content_suggestions = generate_content_suggestions(top_topics)
+        if not deadline.expired():
+            tokenized_comments = await asyncio.to_thread(_tokenize_comments, df_comments["clean_text"].tolist())
+
+        # 6. Topic Modeling (LDA or NMF)
+        mark_stage("topics")
+        formatted_topics = {category: {} for category in SENTIMENT_CATEGORIES}
+        content_suggestions = []
+        vocabulary_report = None
+        comment_topics, topic_terms = None, None
+
+        if deadline.expired():
+            deadline.degrade("topics", "skipped topic modeling")
+        else:
+            passes, nmf_iter, keep_n = 5, NMF_MAX_ITER, 10000
+            if not deadline.allows(TOPICS_FULL_MIN_REMAINING):
+                passes, nmf_iter, keep_n = 1, max(1, NMF_MAX_ITER // 4), 2000
+                deadline.degrade("topics", f"reduced {topic_backend.upper()} effort and vocabulary to {keep_n} terms")
+
+            dictionary, vocabulary_report, topic_term_matrix, comment_topics = await asyncio.to_thread(
+                _fit_topic_model, tokenized_comments, topic_backend, passes, nmf_iter, keep_n
+            )
+
+            if topic_term_matrix is None:
+                logging.warning("Vocabulary is empty after filtering; skipping topic modeling.")
+            else:
+                vocab_masks = build_vocabulary_masks(dictionary)
+
+                # Label every topic by its top terms for the per-comment index
+                topic_term_ids, _ = top_topic_terms(topic_term_matrix, 5)
+                topic_terms = vocab_masks["words"][topic_term_ids].tolist()
+
+                # 7. Word extraction for the frontend
+                formatted_topics = extract_words_from_topics(topic_term_matrix, vocab_masks)
+
+                # 8. Generate content suggestions
+                mark_stage("suggestions")
+                if deadline.allows(SUGGESTIONS_MIN_REMAINING):
+                    content_suggestions = generate_content_suggestions(topic_term_matrix, vocab_masks)
+                else:
+                    deadline.degrade("suggestions", "skipped content suggestions")
 
         # 9. Generate executive summary
+        mark_stage("summary")
         executive_summary = generate_executive_summary(sentiment_counts, formatted_topics, content_suggestions)
 
-        return {
+        result = {
             "status": "Success",
             "sentiment_breakdown": sentiment_counts,
             "topics": formatted_topics,          # For the word cloud (dict with words by sentiment)
             "content_suggestions": content_suggestions,
-            "executive_summary": executive_summary
+            "executive_summary": executive_summary,
+            "filtered_comments": filtered_counts,  # Non-informative comments dropped per category
+            "vocabulary": vocabulary_report,       # Approximation error of the vocabulary sketch
+            "partial": deadline.partial,
+            "degraded_stages": deadline.degraded_stages
         }
 
+        # 10. Keep the result for dashboards
+        mark_stage("store")
+        try:
+            await asyncio.to_thread(get_analysis_store().save_run, video_id, result, channel_id=channel_id)
+        except Exception as e:
+            logging.error(f"Failed to store analysis result for video ID {video_id}: {e}", exc_info=True)
+
+        # 11. Index per-comment results for top-N and term lookups
+        mark_stage("index")
+        try:
+            comment_index = await asyncio.to_thread(
+                CommentIndex.build,
+                df_comments["text"].tolist(),
+                [r["sentiment_score"].get("compound", 0.0) for r in sentiment_results],
+                [r["sentiment"] for r in sentiment_results],
+                tokenized_comments,
+                topics=comment_topics,
+                topic_terms=topic_terms
+            )
+            await asyncio.to_thread(get_comment_index_store().save, video_id, comment_index)
+        except Exception as e:
+            logging.error(f"Failed to index comments for video ID {video_id}: {e}", exc_info=True)
+
+        return result
+
     except Exception as e:
         logging.error(f"Error during ETL pipeline execution: {e}", exc_info=True)
-        return {"status": "Error", "message": str(e)}
+        return _early_result(deadline, "Error", message=str(e))
+
+
+# ---------------------------------------------------------------------
+# 8) AWS LAMBDA HANDLERS
+# ---------------------------------------------------------------------
+# Seconds kept free before the Lambda timeout to build and return the response
+LAMBDA_SAFETY_MARGIN = 2.0
+
+# Minimum pipeline budget (seconds) a batch record needs to be started; later records are deferred
+BATCH_MIN_RECORD_SECONDS = 5.0
+
+# Event loop kept alive across invocations of a warm container (the pooled HTTP client is bound to it)
+_warm_loop = None
+
+
+def _get_warm_loop():
+    """Returns the event loop reused by every invocation of this container."""
+    global _warm_loop
+    if _warm_loop is None or _warm_loop.is_closed():
+        _warm_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_warm_loop)
+    return _warm_loop
+
+
+async def _get_warm_session():
+    """Returns the pooled HTTP session reused by every invocation (must run on the warm loop)."""
+    return await http_client.start(warm_up_url=YOUTUBE_API_URL)
+
+
+def _invocation_deadline(context) -> Deadline:
+    """Bounds a pipeline run by both PIPELINE_DEADLINE_SECONDS and the time left in this invocation."""
+    budget = PIPELINE_DEADLINE_SECONDS
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        budget = min(budget, context.get_remaining_time_in_millis() / 1000 - LAMBDA_SAFETY_MARGIN)
+    return Deadline(max(0.0, budget))
+
+
+def _parse_batch_records(event):
+    """
+    Normalizes batch events into (record_id, video_id) pairs.
+
+    Supported shapes:
+      - SQS-style: {"Records": [{"messageId": "...", "body": "<video link or JSON with videoId/videoLink>"}]}
+      - Scheduled: {"videoIds": [...]} or {"videoLinks": [...]}
+    """
+    records = []
+    for i, record in enumerate(event.get("Records", [])):
+        record_id = record.get("messageId", str(i))
+        body = record.get("body", "")
+        try:
+            payload = json.loads(body)
+        except (TypeError, ValueError):
+            payload = body
+        if isinstance(payload, dict):
+            video_id = payload.get("videoId") or extract_video_id(payload.get("videoLink", ""))
+        else:
+            video_id = extract_video_id(str(payload))
+        records.append((record_id, video_id))
+
+    records += [(video_id, video_id) for video_id in event.get("videoIds", [])]
+    records += [(link, extract_video_id(link)) for link in event.get("videoLinks", [])]
+    return records
+
+
+async def _run_single(video_id, context) -> dict:
+    return await run_etl_pipeline(video_id, deadline=_invocation_deadline(context), session=await _get_warm_session())
+
+
+async def _run_batch(records, context) -> list:
+    session = await _get_warm_session()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def process(record_id, video_id):
+        if not video_id:
+            return {"id": record_id, "videoId": None, "status": "Invalid video link"}
+        async with semaphore:
+            deadline = _invocation_deadline(context)
+            if deadline.budget < BATCH_MIN_RECORD_SECONDS:
+                logging.warning(f"Deferring batch record {record_id}: only {deadline.budget:.2f}s left")
+                return {"id": record_id, "videoId": video_id, "status": "Deferred",
+                        "message": "Not enough invocation time left to analyze this video"}
+            try:
+                result = await run_etl_pipeline(video_id, deadline=deadline, session=session)
+            except Exception as e:
+                logging.error(f"Batch record {record_id} failed: {e}", exc_info=True)
+                result = {"status": "Error", "message": str(e)}
+        return {"id": record_id, "videoId": video_id, **result}
+
+    return await asyncio.gather(*(process(record_id, video_id) for record_id, video_id in records))
+
+
+def _needs_retry(result: dict) -> bool:
+    """Errored and deferred records, and runs that the deadline cut short before producing any data."""
+    status = result.get("status")
+    return status in ("Error", "Deferred") or (status != "Success" and bool(result.get("partial")))
+
+
+def batch_handler(event, context):
+    """
+    Analyzes many videos in one invocation, concurrently and on the warm loop/session.
+
+    Up to BATCH_CONCURRENCY records run at once. Their CPU stages run in worker
+    threads, so fetching one video overlaps analyzing another; the pure-Python
+    stages still contend for the GIL, so CPU-heavy batches gain mostly from that
+    overlap rather than from parallel analysis.
+
+    Records whose pipeline run errored, that were not started because too little
+    invocation time was left, or that the deadline cut short before any data was
+    produced are reported in `batchItemFailures` (SQS partial batch response) so only
+    they are retried; invalid links and videos without comments are final outcomes.
+    """
+    records = _parse_batch_records(event)
+    logging.info(f"Processing batch of {len(records)} records")
+
+    results = _get_warm_loop().run_until_complete(_run_batch(records, context))
+    failures = [{"itemIdentifier": r["id"]} for r in results if _needs_retry(r)]
+
+    logging.info(f"Batch finished: {len(records) - len(failures)} succeeded, {len(failures)} failed")
+    return {"results": results, "batchItemFailures": failures}
 
 
 def lambda_handler(event, context):
-    video_link = event.get("queryStringParameters", {}).get("videoLink", "")
+    if any(key in event for key in ("Records", "videoIds", "videoLinks")):
+        return batch_handler(event, context)
+
+    query_params = event.get("queryStringParameters") or {}
+    video_link = query_params.get("videoLink", "")
     video_id = extract_video_id(video_link)
-    # print(f"video id: {video_id} and video link: {video_link}")
     if not video_id:
         logging.error("Invalid video link provided.")
         return {"status": "Invalid video link"}
-    # TODO: Delete the following line if it's not needed
-    output_format = event.get("queryStringParameters", {}).get("outputFormat", "json").lower()
-    
-    loop = asyncio.get_event_loop()
-    response = loop.run_until_complete(run_etl_pipeline(video_id, output_format))
+
+    profiler = None
+    profile_requested = query_params.get("profile", "").lower() == "true"
+    if should_profile(profile_requested):
+        profiler = RequestProfiler(video_id)
+
+    loop = _get_warm_loop()
+    with profiler or nullcontext():
+        response = loop.run_until_complete(_run_single(video_id, context))
+    if profiler is not None and profile_requested:
+        response["profile"] = profiler.file_names()
 
     return {
         "statusCode": 200,
@@ -342,11 +695,3 @@ def lambda_handler(event, context):
         "body": response
         # "body": json.dumps(response)
     }
-
-# if name == 'main':
-#     lambda_handler({
-#         "queryStringParameters": {
-#             "videoLink": "https://www.youtube.com/watch?v=T7M3PpjBZzw",
-#             "outputFormat": "json"
-#         }
-#     }, None)
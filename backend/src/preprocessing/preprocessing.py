@@ -1,7 +1,8 @@
 import logging
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
 # Gensim
@@ -32,6 +33,59 @@ ALL_STOPWORDS = stop_words.union(CUSTOM_STOPWORDS)
 # Whitelist words that you DON'T want lemmatized or removed, even if they're in stopwords
 WHITELIST = {"this", "text", "us", "of"}
 
+# Comment metadata carried through preprocessing when present in the input
+METADATA_COLUMNS = ["comment_id", "author", "likes", "published_at"]
+
+
+# Prefilter categories for comments that cannot contribute any Latin-script token
+PREFILTER_CATEGORIES = ["empty", "link_only", "timestamp_only", "non_latin", "emoji_only"]
+
+URL_PATTERN = r"http\S+|www\.\S+"
+TIMESTAMP_PATTERN = r"\b\d{1,2}(?::\d{2}){1,2}\b"
+
+
+# ---------------------------------------
+# 0) Vectorized Prefilter
+# ---------------------------------------
+def prefilter_comments(comments: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+    """
+    Drops comments that would end up empty after cleaning, before any expensive NLP runs.
+
+    clean_raw_text() keeps only [a-zA-Z] characters, so comments without Latin letters
+    outside of links and HTML can never produce a token. They are classified in bulk as:
+      - "empty": blank or missing text
+      - "link_only": nothing but URLs
+      - "timestamp_only": nothing but timestamps such as 1:23 or 1:02:03
+      - "non_latin": letters, but none from the Latin alphabet
+      - "emoji_only": emoji, symbols, digits or punctuation only
+
+    :param comments: List of dictionaries, each with a 'text' key.
+    :return: (kept comments, count of dropped comments per category)
+    """
+    if not comments:
+        return [], {category: 0 for category in PREFILTER_CATEGORIES}
+
+    text = pd.Series([c.get("text") for c in comments], dtype=object).fillna("").astype(str)
+    without_markup = text.str.replace(URL_PATTERN, " ", regex=True).str.replace(r"<.*?>", " ", regex=True)
+    without_timestamps = without_markup.str.replace(TIMESTAMP_PATTERN, " ", regex=True)
+
+    has_alnum = r"[^\W_]"
+    conditions = [
+        text.str.strip() == "",
+        text.str.contains(URL_PATTERN, regex=True) & ~without_markup.str.contains(has_alnum, regex=True),
+        without_markup.str.contains(TIMESTAMP_PATTERN, regex=True) & ~without_timestamps.str.contains(has_alnum, regex=True),
+        without_markup.str.contains(r"[^\W\d_]", regex=True) & ~without_markup.str.contains(r"[a-zA-Z]", regex=True),
+        ~without_markup.str.contains(r"[a-zA-Z]", regex=True),
+    ]
+    category = np.select(conditions, PREFILTER_CATEGORIES, default="kept")
+
+    counts = {c: int(n) for c, n in zip(*np.unique(category, return_counts=True))}
+    dropped = {c: counts.get(c, 0) for c in PREFILTER_CATEGORIES}
+    kept = [comment for comment, cat in zip(comments, category) if cat == "kept"]
+
+    logging.info(f"Prefilter kept {len(kept)} of {len(comments)} comments; dropped {dropped}")
+    return kept, dropped
+
 
 # ---------------------------------------
 # 1) Vectorized Cleaning of Raw Text
@@ -53,7 +107,7 @@ def clean_raw_text(series: pd.Series) -> pd.Series:
         series = series.fillna("").astype(str).str.lower()
 
         # 2. Regex replacements in a single pass
-        series = series.str.replace(r"http\S+|www\.\S+", "", regex=True)  # remove URLs
+        series = series.str.replace(URL_PATTERN, "", regex=True)          # remove URLs
         series = series.str.replace(r"<.*?>", "", regex=True)            # remove HTML tags
         series = series.str.replace(r"(\S+)@(\S+)\.(\S+)", r"\1 \2\3", regex=True)  # emails
         series = series.str.replace(r"[^a-zA-Z\s]", " ", regex=True)     # remove special chars
@@ -127,11 +181,12 @@ def preprocess_comments(comments: List[Dict[str, str]],
       3) (Optional) Bigram generation
       4) Re-joining tokens into a final 'clean_text'
 
-    :param comments: List of dictionaries, each with a 'text' key.
+    :param comments: List of dictionaries, each with a 'text' key (and optionally comment metadata).
     :param min_count: Bigram min_count parameter.
     :param threshold: Bigram threshold parameter.
     :param use_bigrams: Whether to generate bigrams.
-    :return: A pandas DataFrame with columns ['text', 'clean_text', 'tokens'] (and optionally 'bigrams').
+    :return: A pandas DataFrame with columns ['text', 'clean_text', 'tokens'], plus any
+             METADATA_COLUMNS present in the input.
     """
     try:
         # Convert to DataFrame
@@ -164,7 +219,8 @@ def preprocess_comments(comments: List[Dict[str, str]],
         df = df[df["clean_text"].str.strip() != ""]
 
         logging.info(f"Preprocessed {len(df)} comments successfully.")
-        return df[["text", "clean_text", "tokens"]]
+        metadata_columns = [c for c in METADATA_COLUMNS if c in df.columns]
+        return df[["text", "clean_text", "tokens"] + metadata_columns]
 
     except Exception as e:
         logging.error(f"Error preprocessing comments: {e}", exc_info=True)
@@ -0,0 +1,133 @@
+import heapq
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from gensim import corpora
+
+from src.config import VOCAB_SKETCH_CAPACITY
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Number of documents folded into the sketch at a time
+VOCAB_BATCH_SIZE = 1000
+
+
+# ---------------------------------------
+# Space-Saving Vocabulary Sketch
+# ---------------------------------------
+class StreamingVocabulary:
+    """
+    Bounded-memory document-frequency counter for building the topic model vocabulary.
+
+    Uses the Space-Saving algorithm: at most `capacity` candidate terms are tracked.
+    When a new term arrives and the sketch is full, the least frequent candidate is
+    evicted and the newcomer inherits its count as an error bound. Any term whose true
+    document frequency exceeds num_docs / capacity is guaranteed to be tracked, and
+    counts are never underestimated. While no eviction happens, counts are exact.
+    """
+
+    def __init__(self, capacity: int = VOCAB_SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.num_docs = 0
+        self.evictions = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add_documents(self, docs: List[List[str]]) -> None:
+        """Folds one batch of tokenized documents into the sketch."""
+        batch_dfs = Counter()
+        for doc in docs:
+            batch_dfs.update(set(doc))
+        self.num_docs += len(docs)
+
+        new_terms = []
+        for term, count in batch_dfs.items():
+            if term in self.counts:
+                self.counts[term] += count
+            else:
+                new_terms.append((count, term))
+        if not new_terms:
+            return
+
+        # Fill free slots with the batch's most frequent new terms
+        new_terms.sort(reverse=True)
+        free = max(0, self.capacity - len(self.counts))
+        for count, term in new_terms[:free]:
+            self.counts[term] = count
+            self.errors[term] = 0
+
+        overflow = new_terms[free:]
+        if not overflow:
+            return
+
+        # Every remaining new term replaces the current minimum
+        heap = [(count, term) for term, count in self.counts.items()]
+        heapq.heapify(heap)
+        for count, term in overflow:
+            min_count, min_term = heapq.heappop(heap)
+            del self.counts[min_term], self.errors[min_term]
+            self.counts[term] = min_count + count
+            self.errors[term] = min_count
+            heapq.heappush(heap, (self.counts[term], term))
+        self.evictions += len(overflow)
+
+    def to_dictionary(self, no_below=2, no_above=0.5, keep_n=10000) -> Tuple[corpora.Dictionary, Dict]:
+        """
+        Builds the final gensim Dictionary with the same rules as Dictionary.filter_extremes().
+
+        :param no_below: Keep terms appearing in at least this many documents.
+        :param no_above: Keep terms appearing in at most this fraction of documents.
+        :param keep_n: Keep at most this many of the most frequent terms.
+        :return: (dictionary, approximation error report)
+        """
+        max_df = no_above * self.num_docs
+        candidates = [(count, term) for term, count in self.counts.items() if no_below <= count <= max_df]
+        kept = heapq.nlargest(keep_n, candidates)
+
+        dictionary = corpora.Dictionary()
+        dictionary.token2id = {term: token_id for token_id, (_, term) in enumerate(kept)}
+        dictionary.dfs = {token_id: count for token_id, (count, _) in enumerate(kept)}
+        dictionary.num_docs = self.num_docs
+
+        return dictionary, self._error_report(kept)
+
+    def _error_report(self, kept: List[Tuple[int, str]]) -> Dict:
+        kept_errors = [self.errors[term] for _, term in kept]
+        cutoff = kept[-1][0] if kept else 0
+        return {
+            "exact": self.evictions == 0,
+            "capacity": self.capacity,
+            "tracked_terms": len(self.counts),
+            "evictions": self.evictions,
+            # Largest possible overestimate of a kept term's document frequency
+            "max_overestimate": max(kept_errors, default=0),
+            # Kept terms whose guaranteed lower bound falls below the cutoff (may not belong in the vocabulary)
+            "uncertain_terms": sum(1 for count, term in kept if count - self.errors[term] < cutoff),
+        }
+
+
+def build_vocabulary(tokenized_docs: Iterable[List[str]],
+                     no_below=2,
+                     no_above=0.5,
+                     keep_n=10000,
+                     capacity: int = VOCAB_SKETCH_CAPACITY,
+                     batch_size: int = VOCAB_BATCH_SIZE) -> Tuple[corpora.Dictionary, Dict]:
+    """
+    Streams tokenized documents batch by batch through a StreamingVocabulary.
+
+    :return: (dictionary, approximation error report)
+    """
+    vocabulary = StreamingVocabulary(capacity)
+    batch = []
+    for doc in tokenized_docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            vocabulary.add_documents(batch)
+            batch = []
+    if batch:
+        vocabulary.add_documents(batch)
+
+    dictionary, report = vocabulary.to_dictionary(no_below=no_below, no_above=no_above, keep_n=keep_n)
+    logging.info(f"Built vocabulary of {len(dictionary)} terms from {vocabulary.num_docs} documents: {report}")
+    return dictionary, report
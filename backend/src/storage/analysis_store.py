@@ -0,0 +1,204 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import ANALYSIS_DB_PATH
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id          TEXT NOT NULL,
+    channel_id        TEXT,
+    run_at            REAL NOT NULL,
+    positive          INTEGER NOT NULL,
+    negative          INTEGER NOT NULL,
+    neutral           INTEGER NOT NULL,
+    mixed             INTEGER NOT NULL,
+    partial           INTEGER NOT NULL DEFAULT 0,
+    degraded_stages   TEXT,
+    suggestions       TEXT,
+    executive_summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_video ON runs (video_id, run_at DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_channel ON runs (channel_id, run_at DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_run_at ON runs (run_at DESC);
+
+-- Pointer to the newest run of every video, maintained on insert (complete runs win over partial ones)
+CREATE TABLE IF NOT EXISTS latest_runs (
+    video_id   TEXT PRIMARY KEY,
+    channel_id TEXT,
+    run_id     INTEGER NOT NULL REFERENCES runs (run_id),
+    run_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_latest_channel ON latest_runs (channel_id, run_at DESC);
+CREATE INDEX IF NOT EXISTS idx_latest_run_at ON latest_runs (run_at DESC);
+
+CREATE TABLE IF NOT EXISTS topic_terms (
+    run_id   INTEGER NOT NULL REFERENCES runs (run_id),
+    category TEXT NOT NULL,
+    term     TEXT NOT NULL,
+    weight   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_terms_run ON topic_terms (run_id);
+"""
+
+RUN_COLUMNS = ("run_id, video_id, channel_id, run_at, positive, negative, neutral, mixed, "
+               "partial, degraded_stages, suggestions, executive_summary")
+
+
+# ---------------------------------------
+# SQLite-Backed History Store
+# ---------------------------------------
+class AnalysisStore:
+    """
+    Local SQLite store of pipeline results, indexed by video, channel and run time.
+
+    Dashboards query it for the latest run per video, a video's history or the top
+    terms across a channel without re-running the pipeline.
+    """
+
+    def __init__(self, db_path: str = ANALYSIS_DB_PATH):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return closing(conn)
+
+    def save_run(self, video_id: str, result: Dict, channel_id: Optional[str] = None,
+                 run_at: Optional[float] = None) -> int:
+        """
+        Persists one successful pipeline result.
+
+        :param result: Dictionary returned by run_etl_pipeline().
+        :return: The new run ID.
+        """
+        run_at = time.time() if run_at is None else run_at
+        counts = result.get("sentiment_breakdown", {})
+        partial = int(bool(result.get("partial")))
+
+        with self._write_lock, self._connection() as conn, conn:
+            cursor = conn.execute(
+                f"INSERT INTO runs ({RUN_COLUMNS.split(', ', 1)[1]}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    video_id, channel_id, run_at,
+                    counts.get("positive", 0), counts.get("negative", 0),
+                    counts.get("neutral", 0), counts.get("mixed", 0),
+                    partial,
+                    json.dumps(result.get("degraded_stages", [])),
+                    json.dumps(result.get("content_suggestions", [])),
+                    result.get("executive_summary"),
+                ),
+            )
+            run_id = cursor.lastrowid
+
+            conn.executemany(
+                "INSERT INTO topic_terms (run_id, category, term, weight) VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, category, term, weight)
+                    for category, words in (result.get("topics") or {}).items()
+                    for term, weight in words.items()
+                ],
+            )
+            # A partial (deadline-degraded) run never replaces a complete one as the latest
+            conn.execute(
+                "INSERT INTO latest_runs (video_id, channel_id, run_id, run_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET channel_id = excluded.channel_id, "
+                "run_id = excluded.run_id, run_at = excluded.run_at WHERE excluded.run_at >= latest_runs.run_at "
+                "AND (? = 0 OR (SELECT partial FROM runs WHERE run_id = latest_runs.run_id) = 1)",
+                (video_id, channel_id, run_id, run_at, partial),
+            )
+        return run_id
+
+    def latest_per_video(self, channel_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Returns the newest complete run of every video (the newest partial one if none is
+        complete), optionally within a channel, most recent first, with topics.
+        """
+        query = (f"SELECT {', '.join('r.' + c for c in RUN_COLUMNS.split(', '))} FROM latest_runs l "
+                 "JOIN runs r ON r.run_id = l.run_id")
+        params: list = []
+        if channel_id is not None:
+            query += " WHERE l.channel_id = ?"
+            params.append(channel_id)
+        query += " ORDER BY l.run_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._connection() as conn:
+            runs = [self._format_run(row) for row in conn.execute(query, params)]
+            self._attach_topics(conn, runs)
+        return runs
+
+    def video_history(self, video_id: str, limit: int = 50) -> List[Dict]:
+        """Returns the runs of one video, most recent first."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {RUN_COLUMNS} FROM runs WHERE video_id = ? ORDER BY run_at DESC LIMIT ?",
+                (video_id, limit),
+            )
+            return [self._format_run(row) for row in rows]
+
+    def top_terms_for_channel(self, channel_id: str, limit: int = 20) -> List[Dict]:
+        """Returns the highest-weighted topic terms summed over the latest run of every video in a channel."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT t.term, SUM(t.weight) AS total_weight, COUNT(DISTINCT l.video_id) AS videos "
+                "FROM latest_runs l JOIN topic_terms t ON t.run_id = l.run_id "
+                "WHERE l.channel_id = ? GROUP BY t.term ORDER BY total_weight DESC LIMIT ?",
+                (channel_id, limit),
+            )
+            return [{"term": term, "weight": weight, "videos": videos} for term, weight, videos in rows]
+
+    @staticmethod
+    def _format_run(row) -> Dict:
+        (run_id, video_id, channel_id, run_at, positive, negative, neutral, mixed,
+         partial, degraded_stages, suggestions, executive_summary) = row
+        return {
+            "run_id": run_id,
+            "video_id": video_id,
+            "channel_id": channel_id,
+            "run_at": datetime.fromtimestamp(run_at, tz=timezone.utc).isoformat(),
+            "sentiment_breakdown": {"positive": positive, "negative": negative, "neutral": neutral, "mixed": mixed},
+            "partial": bool(partial),
+            "degraded_stages": json.loads(degraded_stages or "[]"),
+            "content_suggestions": json.loads(suggestions or "[]"),
+            "executive_summary": executive_summary,
+        }
+
+    @staticmethod
+    def _attach_topics(conn, runs: List[Dict]) -> None:
+        if not runs:
+            return
+        by_id = {run["run_id"]: run for run in runs}
+        for run in runs:
+            run["topics"] = {}
+        placeholders = ", ".join("?" * len(by_id))
+        rows = conn.execute(
+            f"SELECT run_id, category, term, weight FROM topic_terms WHERE run_id IN ({placeholders})",
+            list(by_id),
+        )
+        for run_id, category, term, weight in rows:
+            by_id[run_id]["topics"].setdefault(category, {})[term] = weight
+
+
+_analysis_store: Optional[AnalysisStore] = None
+
+
+def get_analysis_store() -> AnalysisStore:
+    """Returns the shared store, creating the database on first use."""
+    global _analysis_store
+    if _analysis_store is None:
+        _analysis_store = AnalysisStore()
+    return _analysis_store
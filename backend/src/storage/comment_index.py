@@ -0,0 +1,267 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import COMMENT_INDEX_DIR, COMMENT_INDEX_CACHE_SIZE
+from src.topic_modeling.topics import NO_TOPIC
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Label codes stored in the label column
+LABELS = ("POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED")
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+# Arrays every stored index must contain (older files without them are ignored)
+INDEX_ARRAYS = {
+    "text_offsets", "text_blob", "scores", "labels", "topics", "topic_terms", "score_order",
+    "label_offsets", "label_postings", "terms", "term_offsets", "term_postings",
+    "term_label_offsets", "term_label_postings",
+}
+
+# Video IDs double as file names
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+# ---------------------------------------
+# Columnar Per-Comment Index
+# ---------------------------------------
+class CommentIndex:
+    """
+    Per-comment results of one analysis, stored column-wise in NumPy arrays.
+
+    Columns: UTF-8 text (one blob plus offsets), compound score (float32), label
+    code (uint8) and topic ID (int16). Four indexes are built once:
+      - score_order: comment IDs sorted by ascending score
+      - label postings: per label, comment IDs sorted by ascending score (CSR layout)
+      - term postings: per token, comment IDs sorted by ascending score (CSR layout)
+      - term-label postings: per (token, label), comment IDs sorted by ascending score
+
+    Every query slices one of these sorted lists, so a page costs O(limit) after an
+    O(log V) term lookup.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.text_offsets = arrays["text_offsets"]
+        self.text_blob = arrays["text_blob"]
+        self.scores = arrays["scores"]
+        self.labels = arrays["labels"]
+        self.topics = arrays["topics"]
+        self.topic_terms = arrays["topic_terms"]
+        self.score_order = arrays["score_order"]
+        self.label_offsets = arrays["label_offsets"]
+        self.label_postings = arrays["label_postings"]
+        self.terms = arrays["terms"]
+        self.term_offsets = arrays["term_offsets"]
+        self.term_postings = arrays["term_postings"]
+        self.term_label_offsets = arrays["term_label_offsets"]
+        self.term_label_postings = arrays["term_label_postings"]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], scores: Sequence[float], labels: Sequence[str],
+              tokens: Sequence[Sequence[str]], topics: Optional[Sequence[int]] = None,
+              topic_terms: Optional[List[List[str]]] = None) -> "CommentIndex":
+        """
+        Builds the columns and indexes from per-comment pipeline results.
+
+        :param texts: Original comment texts.
+        :param scores: VADER compound scores.
+        :param labels: Sentiment labels (one of LABELS).
+        :param tokens: Normalized tokens of every comment, used for the term index.
+        :param topics: Dominant topic ID of every comment (NO_TOPIC if none).
+        :param topic_terms: Top terms of every topic ID.
+        :return: CommentIndex
+        """
+        num_comments = len(texts)
+        encoded = [text.encode("utf-8") for text in texts]
+        text_offsets = np.zeros(num_comments + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=text_offsets[1:])
+        text_blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        scores = np.asarray(scores, dtype=np.float32).reshape(num_comments)
+        label_codes = np.array([LABEL_CODES[label] for label in labels], dtype=np.uint8).reshape(num_comments)
+        topics = (np.full(num_comments, NO_TOPIC, dtype=np.int16) if topics is None
+                  else np.asarray(topics, dtype=np.int16).reshape(num_comments))
+
+        # Score index; ties keep comment order
+        score_order = np.argsort(scores, kind="stable").astype(np.int32)
+        rank = np.empty(num_comments, dtype=np.int64)
+        rank[score_order] = np.arange(num_comments)
+
+        # Label postings: a stable sort of the score order by label keeps each run score-sorted
+        label_postings = score_order[np.argsort(label_codes[score_order], kind="stable")]
+        label_offsets = np.zeros(len(LABELS) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(label_codes, minlength=len(LABELS)), out=label_offsets[1:])
+
+        # Term postings: unique (term, comment) pairs ordered by term, then score rank
+        pair_terms, pair_docs = [], []
+        for doc_id, doc_tokens in enumerate(tokens):
+            unique_tokens = set(doc_tokens)
+            pair_terms.extend(unique_tokens)
+            pair_docs.extend([doc_id] * len(unique_tokens))
+        terms, term_codes = np.unique(np.array(pair_terms, dtype=str), return_inverse=True)
+        pair_docs = np.array(pair_docs, dtype=np.int32)
+        order = np.lexsort((rank[pair_docs], term_codes))
+        term_postings = pair_docs[order]
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_codes, minlength=len(terms)), out=term_offsets[1:])
+
+        # Term-label postings: the same pairs ordered by term, label, then score rank
+        pair_keys = term_codes * len(LABELS) + label_codes[pair_docs]
+        term_label_postings = pair_docs[np.lexsort((rank[pair_docs], pair_keys))]
+        term_label_offsets = np.zeros(len(terms) * len(LABELS) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_keys, minlength=len(terms) * len(LABELS)), out=term_label_offsets[1:])
+
+        return cls({
+            "text_offsets": text_offsets,
+            "text_blob": text_blob,
+            "scores": scores,
+            "labels": label_codes,
+            "topics": topics,
+            "topic_terms": np.array(topic_terms, dtype=str) if topic_terms else np.empty((0, 0), dtype=str),
+            "score_order": score_order,
+            "label_offsets": label_offsets,
+            "label_postings": label_postings,
+            "terms": terms,
+            "term_offsets": term_offsets,
+            "term_postings": term_postings,
+            "term_label_offsets": term_label_offsets,
+            "term_label_postings": term_label_postings,
+        })
+
+    def query(self, order="asc", label: Optional[str] = None, term: Optional[str] = None,
+              offset=0, limit=20) -> Dict:
+        """
+        Returns one page of comments sorted by score.
+
+        :param order: "asc" (most negative first) or "desc" (most positive first).
+        :param label: Restrict to one sentiment label.
+        :param term: Restrict to comments containing this normalized token.
+        :param offset: Number of matching comments to skip.
+        :param limit: Page size.
+        :return: dict with the total number of matches and the page of comments.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported order: {order}")
+        if label is not None and label not in LABEL_CODES:
+            raise ValueError(f"Unsupported label: {label}")
+
+        if term is not None:
+            candidates = self._term_postings(term, label)
+        elif label is not None:
+            code = LABEL_CODES[label]
+            candidates = self.label_postings[self.label_offsets[code]:self.label_offsets[code + 1]]
+        else:
+            candidates = self.score_order
+
+        total = len(candidates)
+        if order == "asc":
+            page = candidates[offset:offset + limit]
+        else:
+            page = candidates[max(0, total - offset - limit):max(0, total - offset)][::-1]
+
+        return {"total": total, "comments": [self._comment(int(i)) for i in page]}
+
+    def _term_postings(self, term: str, label: Optional[str] = None) -> np.ndarray:
+        position = int(np.searchsorted(self.terms, term))
+        if position == len(self.terms) or self.terms[position] != term:
+            return self.term_postings[:0]
+        if label is None:
+            return self.term_postings[self.term_offsets[position]:self.term_offsets[position + 1]]
+        key = position * len(LABELS) + LABEL_CODES[label]
+        return self.term_label_postings[self.term_label_offsets[key]:self.term_label_offsets[key + 1]]
+
+    def _comment(self, comment_id: int) -> Dict:
+        topic = int(self.topics[comment_id])
+        start, end = self.text_offsets[comment_id], self.text_offsets[comment_id + 1]
+        return {
+            "id": comment_id,
+            "text": self.text_blob[start:end].tobytes().decode("utf-8"),
+            "score": round(float(self.scores[comment_id]), 4),
+            "label": LABELS[self.labels[comment_id]],
+            "topic": topic if topic != NO_TOPIC else None,
+            "topic_terms": self.topic_terms[topic].tolist() if 0 <= topic < len(self.topic_terms) else [],
+        }
+
+
+# ---------------------------------------
+# On-Disk Store With an In-Memory LRU
+# ---------------------------------------
+class CommentIndexStore:
+    """
+    Keeps the latest CommentIndex of every video as a compressed .npz file and the
+    most recently used ones in memory.
+    """
+
+    def __init__(self, index_dir: str = COMMENT_INDEX_DIR, cache_size: int = COMMENT_INDEX_CACHE_SIZE):
+        self.index_dir = Path(index_dir)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, CommentIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, video_id: str) -> Path:
+        if not VIDEO_ID_PATTERN.match(video_id):
+            raise ValueError(f"Invalid video ID: {video_id}")
+        return self.index_dir / f"{video_id}.npz"
+
+    def save(self, video_id: str, index: CommentIndex) -> None:
+        """Writes the index atomically, replacing the video's previous one."""
+        path = self._path(video_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **index.arrays)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        self._remember(video_id, index)
+        logging.info(f"Indexed {len(index)} comments for video ID: {video_id}")
+
+    def get(self, video_id: str) -> Optional[CommentIndex]:
+        """Returns the video's index, loading it from disk if it is not cached."""
+        with self._lock:
+            index = self._cache.get(video_id)
+            if index is not None:
+                self._cache.move_to_end(video_id)
+                return index
+
+        path = self._path(video_id)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if not INDEX_ARRAYS <= set(data.files):
+                logging.warning(f"Comment index for video ID {video_id} predates the current format; re-run the analysis")
+                return None
+            index = CommentIndex({name: data[name] for name in data.files})
+        self._remember(video_id, index)
+        return index
+
+    def _remember(self, video_id: str, index: CommentIndex) -> None:
+        with self._lock:
+            self._cache[video_id] = index
+            self._cache.move_to_end(video_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+_comment_index_store: Optional[CommentIndexStore] = None
+
+
+def get_comment_index_store() -> CommentIndexStore:
+    """Returns the shared store, creating the index directory on first use."""
+    global _comment_index_store
+    if _comment_index_store is None:
+        _comment_index_store = CommentIndexStore()
+    return _comment_index_store
@@ -0,0 +1,85 @@
+import logging
+from typing import List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Guards divisions in the multiplicative updates
+EPSILON = 1e-10
+
+
+# ---------------------------------------
+# 1) Sparse TF-IDF Matrix
+# ---------------------------------------
+def bow_to_tfidf_matrix(corpus: List[List[Tuple[int, int]]], num_terms: int) -> sparse.csr_matrix:
+    """
+    Builds an L2-normalized TF-IDF document-term matrix from a gensim bag-of-words corpus.
+
+    :param corpus: One list of (term_id, count) pairs per document, as from Dictionary.doc2bow().
+    :param num_terms: Vocabulary size.
+    :return: Sparse matrix of shape (num_docs, num_terms).
+    """
+    lengths = np.fromiter((len(doc) for doc in corpus), dtype=np.int64, count=len(corpus))
+    rows = np.repeat(np.arange(len(corpus)), lengths)
+    pairs = np.array([pair for doc in corpus for pair in doc], dtype=np.float64).reshape(-1, 2)
+
+    counts = sparse.csr_matrix((pairs[:, 1], (rows, pairs[:, 0].astype(np.int64))), shape=(len(corpus), num_terms))
+
+    # Smoothed inverse document frequency, as in sklearn's TfidfTransformer
+    dfs = np.bincount(counts.indices, minlength=num_terms)
+    idf = np.log((1 + len(corpus)) / (1 + dfs)) + 1
+    tfidf = counts.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(tfidf.multiply(1 / norms[:, None]))
+
+
+# ---------------------------------------
+# 2) Multiplicative-Update NMF
+# ---------------------------------------
+def nmf(matrix: sparse.csr_matrix, num_topics: int, max_iter=200, random_state=42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorizes a non-negative matrix X ~ W @ H with Lee & Seung multiplicative updates
+    (Frobenius loss) under a fixed iteration budget.
+
+    :param matrix: Sparse document-term matrix of shape (num_docs, num_terms).
+    :param num_topics: Number of topics (rank of the factorization).
+    :param max_iter: Number of update rounds.
+    :param random_state: Seed for the random initialization.
+    :return: (W of shape (num_docs, num_topics), H of shape (num_topics, num_terms))
+    """
+    num_docs, num_terms = matrix.shape
+    rng = np.random.default_rng(random_state)
+
+    # Random init scaled to the data, as in sklearn's init="random"
+    scale = np.sqrt(matrix.sum() / (num_docs * num_terms * num_topics)) if matrix.nnz else 1.0
+    W = scale * rng.random((num_docs, num_topics))
+    H = scale * rng.random((num_topics, num_terms))
+
+    matrix_t = matrix.T.tocsr()
+    for _ in range(max_iter):
+        H *= (matrix_t @ W).T / (W.T @ W @ H + EPSILON)
+        W *= (matrix @ H.T) / (W @ (H @ H.T) + EPSILON)
+
+    return W, H
+
+
+def fit_nmf_topics(corpus: List[List[Tuple[int, int]]], num_terms: int, num_topics=10, max_iter=200,
+                   random_state=42) -> np.ndarray:
+    """
+    Fits NMF topics on the TF-IDF of a bag-of-words corpus.
+
+    :return: Topic-term matrix of shape (num_topics, num_terms) with rows summing to 1,
+             the same layout as LdaModel.get_topics().
+    """
+    tfidf = bow_to_tfidf_matrix(corpus, num_terms)
+    _, H = nmf(tfidf, num_topics, max_iter=max_iter, random_state=random_state)
+
+    totals = H.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1.0
+    logging.info(f"Fitted NMF with {num_topics} topics over {tfidf.shape[0]} documents and {num_terms} terms")
+    return H / totals
+
@@ -0,0 +1,46 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from src.topic_modeling.nmf import bow_to_tfidf_matrix
+
+# Supported values of TOPIC_BACKEND / the topicBackend query parameter
+TOPIC_BACKENDS = {"lda", "nmf"}
+
+# Topic ID of documents without any known term
+NO_TOPIC = -1
+
+
+# ---------------------------------------
+# Per-Document Topic Assignment
+# ---------------------------------------
+def assign_topics(corpus: List[List[Tuple[int, int]]], topic_term_matrix: np.ndarray) -> np.ndarray:
+    """
+    Assigns every document its dominant topic by projecting its TF-IDF vector onto a
+    topic-term matrix (used for NMF topics, which are fitted on the same TF-IDF).
+
+    :param corpus: One list of (term_id, count) pairs per document.
+    :param topic_term_matrix: Array of shape (num_topics, num_terms).
+    :return: Topic ID per document, NO_TOPIC for documents without known terms.
+    """
+    tfidf = bow_to_tfidf_matrix(corpus, topic_term_matrix.shape[1])
+    topics = np.asarray(tfidf @ topic_term_matrix.T).argmax(axis=1)
+    topics[tfidf.getnnz(axis=1) == 0] = NO_TOPIC
+    return topics
+
+
+def assign_lda_topics(lda_model, corpus: List[List[Tuple[int, int]]]) -> np.ndarray:
+    """
+    Assigns every document its most probable topic under the LDA model's own
+    variational inference (the same posterior as get_document_topics()).
+
+    :param lda_model: Trained gensim LdaModel.
+    :param corpus: One list of (term_id, count) pairs per document.
+    :return: Topic ID per document, NO_TOPIC for documents without known terms.
+    """
+    if not corpus:
+        return np.empty(0, dtype=np.int64)
+    gamma, _ = lda_model.inference(corpus)
+    topics = gamma.argmax(axis=1)
+    topics[np.array([len(doc) == 0 for doc in corpus])] = NO_TOPIC
+    return topics
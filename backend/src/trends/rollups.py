@@ -0,0 +1,203 @@
+import logging
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from src.config import ANALYSIS_DB_PATH
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# ---------------------------------------
+# Global Objects & Configuration
+# ---------------------------------------
+# Supported bucket sizes -> pandas floor frequency
+GRANULARITIES = {"hour": "h", "day": "D"}
+
+SENTIMENT_LABELS = ["POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED"]
+
+# Per-bucket aggregate layout: one count per label, then the like-weighted score sum and weight sum
+AGGREGATE_COLUMNS = SENTIMENT_LABELS + ["weighted_score", "weight"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trend_buckets (
+    video_id       TEXT NOT NULL,
+    granularity    TEXT NOT NULL,
+    bucket_start   INTEGER NOT NULL,
+    positive       INTEGER NOT NULL,
+    negative       INTEGER NOT NULL,
+    neutral        INTEGER NOT NULL,
+    mixed          INTEGER NOT NULL,
+    weighted_score REAL NOT NULL,
+    weight         REAL NOT NULL,
+    PRIMARY KEY (video_id, granularity, bucket_start)
+) WITHOUT ROWID;
+
+-- Comments already folded into the buckets, so re-runs only add unseen comments
+CREATE TABLE IF NOT EXISTS trend_comments (
+    video_id   TEXT NOT NULL,
+    comment_id TEXT NOT NULL,
+    PRIMARY KEY (video_id, comment_id)
+) WITHOUT ROWID;
+"""
+
+BUCKET_COLUMNS = "positive, negative, neutral, mixed, weighted_score, weight"
+
+# Comment IDs looked up per query (below SQLite's bound-parameter limit)
+ID_LOOKUP_CHUNK = 500
+
+
+# ---------------------------------------
+# Rollup Store
+# ---------------------------------------
+class TrendRollupStore:
+    """
+    SQLite store of pre-aggregated sentiment per video and time bucket.
+
+    Every bucket only keeps label counts plus a like-weighted compound score sum,
+    so new comments are folded in incrementally and trend queries are answered
+    from the rollups without rescanning comments. The IDs of folded comments are
+    kept alongside, and the tables live in the analysis history database so every
+    worker shares them and they survive restarts.
+    """
+
+    def __init__(self, db_path: str = ANALYSIS_DB_PATH):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return closing(conn)
+
+    def ingest(self,
+               video_id: str,
+               comment_ids: Sequence[str],
+               published_at: Sequence[str],
+               likes: Sequence[int],
+               labels: Sequence[str],
+               scores: Sequence[float]) -> int:
+        """
+        Folds a batch of analyzed comments into the hourly and daily rollups.
+
+        Comments whose ID was already folded in for this video are skipped, so
+        re-running the pipeline on the same video only adds unseen comments.
+
+        :param video_id: The YouTube video ID.
+        :param comment_ids: YouTube comment IDs, one per comment.
+        :param published_at: ISO-8601 publish timestamps, one per comment.
+        :param likes: Like counts, one per comment.
+        :param labels: Sentiment labels (POSITIVE/NEGATIVE/NEUTRAL/MIXED), one per comment.
+        :param scores: Compound sentiment scores, one per comment.
+        :return: The number of comments added to the rollups.
+        """
+        df = pd.DataFrame({
+            "comment_id": pd.Series(list(comment_ids), dtype=object),
+            "published_at": pd.to_datetime(pd.Series(list(published_at), dtype=object), utc=True, errors="coerce"),
+            "likes": pd.to_numeric(pd.Series(list(likes), dtype=object), errors="coerce"),
+            "label": list(labels),
+            "score": pd.to_numeric(pd.Series(list(scores), dtype=object), errors="coerce"),
+        })
+        df = df.dropna(subset=["comment_id", "published_at"]).drop_duplicates("comment_id")
+        if df.empty:
+            return 0
+
+        with self._write_lock, self._connection() as conn, conn:
+            # Claim the database before reading seen IDs so concurrent workers cannot double count
+            conn.execute("BEGIN IMMEDIATE")
+            ids = df["comment_id"].astype(str).tolist()
+            seen = set()
+            for i in range(0, len(ids), ID_LOOKUP_CHUNK):
+                chunk = ids[i:i + ID_LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT comment_id FROM trend_comments WHERE video_id = ? "
+                    f"AND comment_id IN ({', '.join('?' * len(chunk))})",
+                    [video_id, *chunk],
+                )
+                seen.update(comment_id for (comment_id,) in rows)
+            df = df[~df["comment_id"].astype(str).isin(seen)]
+            if df.empty:
+                return 0
+
+            # Every comment counts at least once; each like adds one more vote
+            df = df.assign(weight=df["likes"].fillna(0).clip(lower=0) + 1)
+            df = df.assign(weighted_score=df["score"].fillna(0.0) * df["weight"])
+            for label in SENTIMENT_LABELS:
+                df[label] = (df["label"] == label).astype(int)
+
+            for granularity, freq in GRANULARITIES.items():
+                grouped = df.groupby(df["published_at"].dt.floor(freq))[AGGREGATE_COLUMNS].sum()
+                conn.executemany(
+                    f"INSERT INTO trend_buckets (video_id, granularity, bucket_start, {BUCKET_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (video_id, granularity, bucket_start) "
+                    "DO UPDATE SET positive = positive + excluded.positive, "
+                    "negative = negative + excluded.negative, neutral = neutral + excluded.neutral, "
+                    "mixed = mixed + excluded.mixed, weighted_score = weighted_score + excluded.weighted_score, "
+                    "weight = weight + excluded.weight",
+                    [
+                        (video_id, granularity, int(bucket_start.timestamp()), *values)
+                        for bucket_start, values in zip(grouped.index, grouped.to_numpy().tolist())
+                    ],
+                )
+
+            conn.executemany(
+                "INSERT INTO trend_comments (video_id, comment_id) VALUES (?, ?)",
+                [(video_id, comment_id) for comment_id in df["comment_id"].astype(str)],
+            )
+
+        logging.info(f"Folded {len(df)} comments into trend rollups for video ID: {video_id}")
+        return len(df)
+
+    def get_trend(self, video_id: str, granularity: str = "hour") -> List[Dict]:
+        """
+        Returns the sentiment trend of a video, one entry per non-empty bucket in time order.
+
+        :param video_id: The YouTube video ID.
+        :param granularity: "hour" or "day".
+        :return: list of dicts:
+            {
+                "bucket_start": "2024-01-01T10:00:00+00:00",
+                "counts": {"positive": n, "negative": n, "neutral": n, "mixed": n},
+                "total": n,
+                "like_weighted_score": float
+            }
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT bucket_start, {BUCKET_COLUMNS} FROM trend_buckets "
+                "WHERE video_id = ? AND granularity = ? ORDER BY bucket_start",
+                (video_id, granularity),
+            ).fetchall()
+
+        return [self._format_bucket(bucket_start, list(values)) for bucket_start, *values in rows]
+
+    @staticmethod
+    def _format_bucket(bucket_start: int, values: List[float]) -> Dict:
+        counts = {label.lower(): int(count) for label, count in zip(SENTIMENT_LABELS, values)}
+        weighted_score, weight = values[-2], values[-1]
+        return {
+            "bucket_start": pd.Timestamp(bucket_start, unit="s", tz="UTC").isoformat(),
+            "counts": counts,
+            "total": sum(counts.values()),
+            "like_weighted_score": round(weighted_score / weight, 4) if weight else 0.0,
+        }
+
+
+_rollup_store: Optional[TrendRollupStore] = None
+
+
+def get_rollup_store() -> TrendRollupStore:
+    """Returns the shared store used by the pipeline and the API, creating its tables on first use."""
+    global _rollup_store
+    if _rollup_store is None:
+        _rollup_store = TrendRollupStore()
+    return _rollup_store
@@ -0,0 +1,51 @@
+import logging
+import time
+from typing import List
+
+# ---------------------------------------
+# Stage Thresholds
+# ---------------------------------------
+# Fraction of the request budget that must still remain for a stage to run at full quality
+FETCH_MIN_REMAINING = 0.6        # stop paginating once 40% of the budget is spent
+BIGRAMS_MIN_REMAINING = 0.5      # bigram detection is optional
+TOPICS_FULL_MIN_REMAINING = 0.35 # below this, LDA runs with fewer passes and a smaller vocabulary
+SUGGESTIONS_MIN_REMAINING = 0.1  # content suggestions are optional
+
+
+class Deadline:
+    """
+    Per-request time budget shared by every pipeline stage.
+
+    Stages check the remaining budget before doing expensive work and call
+    `degrade()` when they cut corners, so the final result can be flagged as partial.
+    """
+
+    def __init__(self, budget_seconds: float):
+        self.budget = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+        self.degraded_stages: List[str] = []
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def fraction_remaining(self) -> float:
+        """Share of the original budget that is still available, between 0 and 1."""
+        return self.remaining() / self.budget if self.budget > 0 else 0.0
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, min_fraction: float) -> bool:
+        """Whether at least `min_fraction` of the budget remains."""
+        return self.fraction_remaining() >= min_fraction
+
+    def degrade(self, stage: str, reason: str) -> None:
+        """Records that a stage was shortened or skipped to stay within the deadline."""
+        logging.warning(f"Degrading stage '{stage}' ({reason}); {self.remaining():.2f}s of {self.budget:.2f}s left")
+        if stage not in self.degraded_stages:
+            self.degraded_stages.append(stage)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.degraded_stages)
@@ -0,0 +1,108 @@
+import gzip
+import hashlib
+from typing import Optional
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+from src.config import RESULT_CACHE_MAX_AGE
+
+# Bump when the shape of pipeline results changes so old ETags stop matching
+RESULT_SCHEMA_VERSION = "1"
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 500
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the serialized result and the result schema version."""
+    digest = hashlib.sha256(RESULT_SCHEMA_VERSION.encode("utf-8") + b"\0" + body).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an ETag.
+
+    Encoding suffixes ("-gzip", "-br") are ignored: every encoding of the same body
+    carries the same content, so any of them is still valid for the client.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == base or candidate.rsplit("-", 1)[0] == base:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Picks 'br' (if brotli is installed), then 'gzip', from an Accept-Encoding header; None for identity."""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def cacheable_json_response(request: Request, payload: dict, cacheable: bool = True) -> Response:
+    """
+    Serializes a result with orjson and makes it cacheable by clients and CDNs.
+
+    - Strong ETag per representation (content plus encoding); If-None-Match hits get
+      an empty 304 carrying the ETag the 200 would have had.
+    - gzip/brotli compression negotiated from Accept-Encoding.
+    - Cache-Control lets shared caches keep successful results for RESULT_CACHE_MAX_AGE
+      seconds; non-cacheable (e.g. partial) results must be revalidated every time.
+
+    :param cacheable: Whether shared caches may store the result.
+    """
+    body = orjson.dumps(payload)
+    etag = compute_etag(body)
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": f"public, max-age={RESULT_CACHE_MAX_AGE}" if cacheable else "no-cache",
+    }
+
+    # Negotiate first so a 304 carries the same ETag as the 200 this client would get
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding:
+        headers["ETag"] = f'"{etag.strip(chr(34))}-{encoding}"'
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding == "br":
+        body = brotli.compress(body, quality=5)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=6)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
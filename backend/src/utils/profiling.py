@@ -0,0 +1,165 @@
+import contextvars
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config import PROFILING_ENABLED, PROFILING_SAMPLE_RATE, PROFILING_OUTPUT_DIR
+
+# Seconds between two stack samples
+SAMPLING_INTERVAL = 0.005
+
+# Number of functions listed in the text summary
+TOP_FUNCTIONS = 25
+
+# Labels usable as-is in profile file names; anything else is hashed
+SAFE_LABEL_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Profiler of the pipeline run in the current task (None when profiling is off)
+_active_profiler: contextvars.ContextVar = contextvars.ContextVar("active_profiler", default=None)
+
+
+def should_profile(requested: bool = False) -> bool:
+    """
+    Decides whether a request is profiled: either explicitly requested while
+    PROFILING_ENABLED is set, or picked at random with PROFILING_SAMPLE_RATE.
+    """
+    if requested and PROFILING_ENABLED:
+        return True
+    return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+
+
+def mark_stage(stage: str) -> None:
+    """Annotates the active profile (if any) with the pipeline stage that starts now."""
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.mark_stage(stage)
+
+
+class RequestProfiler:
+    """
+    Sampling profiler for a single pipeline run.
+
+    A background thread snapshots the stack of the thread that started the profiler
+    every SAMPLING_INTERVAL seconds. Each sample is prefixed with the current pipeline
+    stage, and on stop() the samples are written as collapsed stacks (`.folded`, readable
+    by flamegraph.pl or speedscope) plus a top-functions summary.
+
+    Note: under concurrent requests the event loop thread also runs other tasks, so
+    their frames can show up in the profile too.
+    """
+
+    def __init__(self, label: str, output_dir: str = PROFILING_OUTPUT_DIR, interval: float = SAMPLING_INTERVAL):
+        self.label = label
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.current_stage = "start"
+        self.stage_durations: Dict[str, float] = {}
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target_thread_id: Optional[int] = None
+        self._token = None
+        self._stage_started = 0.0
+        self.output_files: Dict[str, str] = {}
+
+    def __enter__(self) -> "RequestProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> bool:
+        self.stop()
+        return False
+
+    def start(self) -> "RequestProfiler":
+        self._target_thread_id = threading.get_ident()
+        self._token = _active_profiler.set(self)
+        self._stage_started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name=f"profiler-{self.label}", daemon=True)
+        self._thread.start()
+        return self
+
+    def mark_stage(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stage_durations[self.current_stage] = self.stage_durations.get(self.current_stage, 0.0) + now - self._stage_started
+        self.current_stage = stage
+        self._stage_started = now
+
+    def stop(self) -> Dict[str, str]:
+        """
+        Stops sampling and writes the profile files.
+
+        :return: dict with the paths of the 'folded' stacks and the 'summary' file.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.mark_stage("done")
+        _active_profiler.reset(self._token)
+
+        try:
+            self.output_files = self._write()
+        except Exception as e:
+            logging.error(f"Failed to write profile for {self.label}: {e}", exc_info=True)
+        return self.output_files
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.append(f"stage:{self.current_stage}")
+            self._stacks[";".join(reversed(stack))] += 1
+
+    def _write(self) -> Dict[str, str]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"{self._file_label()}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+        folded_path = base.with_suffix(".folded")
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        summary_path = base.with_suffix(".summary.txt")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(self._summary())
+
+        logging.info(f"Profile for {self.label} written to {folded_path}")
+        return {"folded": str(folded_path), "summary": str(summary_path)}
+
+    def _file_label(self) -> str:
+        """Label safe to use in a file name, so a crafted video ID cannot escape output_dir."""
+        if SAFE_LABEL_PATTERN.match(self.label):
+            return self.label
+        return "label-" + hashlib.sha256(self.label.encode("utf-8")).hexdigest()[:16]
+
+    def file_names(self) -> Dict[str, str]:
+        """Names (without the server directory) of the written profile files, safe to return to callers."""
+        return {kind: Path(path).name for kind, path in self.output_files.items()}
+
+    def _summary(self) -> str:
+        total = sum(self._stacks.values()) or 1
+        self_samples, inclusive_samples = Counter(), Counter()
+        for stack, count in self._stacks.items():
+            frames = stack.split(";")[1:]
+            if frames:
+                self_samples[frames[-1]] += count
+            for frame in set(frames):
+                inclusive_samples[frame] += count
+
+        lines = [f"Profile: {self.label} ({total} samples every {self.interval * 1000:.1f} ms)", "", "Stage wall time:"]
+        lines += [f"  {stage:<20} {seconds:8.3f}s" for stage, seconds in self.stage_durations.items()]
+        lines += ["", "Top functions by self samples:"]
+        lines += [f"  {count / total:6.1%}  {name}" for name, count in self_samples.most_common(TOP_FUNCTIONS)]
+        lines += ["", "Top functions by inclusive samples:"]
+        lines += [f"  {count / total:6.1%}  {name}" for name, count in inclusive_samples.most_common(TOP_FUNCTIONS)]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,55 @@
+from src.storage.analysis_store import AnalysisStore
+
+def make_result(positive: int, terms: dict) -> dict:
+    """Builds a minimal pipeline result."""
+    return {
+        'status': 'Success',
+        'sentiment_breakdown': {'positive': positive, 'negative': 1, 'neutral': 0, 'mixed': 0},
+        'topics': {'positive': terms, 'negative': {}, 'neutral': {}, 'mixed': {}},
+        'content_suggestions': ['Encourage comments, likes, and shares.'],
+        'executive_summary': 'summary',
+        'partial': False,
+        'degraded_stages': [],
+    }
+
+def test_latest_and_history(tmp_path) -> None:
+    """Test that the latest run per video and a video's history are returned newest first."""
+    store = AnalysisStore(str(tmp_path / 'analysis.db'))
+    store.save_run('video1', make_result(1, {'audio': 100}), channel_id='chan', run_at=1000)
+    store.save_run('video1', make_result(2, {'music': 200}), channel_id='chan', run_at=2000)
+    store.save_run('video2', make_result(3, {'audio': 50}), channel_id='other', run_at=1500)
+
+    latest = store.latest_per_video()
+    assert [(r['video_id'], r['sentiment_breakdown']['positive']) for r in latest] == [('video1', 2), ('video2', 3)]
+    assert latest[0]['topics'] == {'positive': {'music': 200}}
+    assert [r['video_id'] for r in store.latest_per_video(channel_id='other')] == ['video2']
+
+    history = store.video_history('video1')
+    assert [r['sentiment_breakdown']['positive'] for r in history] == [2, 1]
+    assert history[0]['content_suggestions'] == ['Encourage comments, likes, and shares.']
+
+def test_top_terms_across_channel(tmp_path) -> None:
+    """Test that channel terms are summed over the latest run of each video only."""
+    store = AnalysisStore(str(tmp_path / 'analysis.db'))
+    store.save_run('video1', make_result(1, {'audio': 999}), channel_id='chan', run_at=1000)
+    store.save_run('video1', make_result(1, {'audio': 100, 'music': 300}), channel_id='chan', run_at=2000)
+    store.save_run('video2', make_result(1, {'audio': 150}), channel_id='chan', run_at=1500)
+
+    assert store.top_terms_for_channel('chan') == [
+        {'term': 'music', 'weight': 300, 'videos': 1},
+        {'term': 'audio', 'weight': 250, 'videos': 2},
+    ]
+
+def test_partial_run_does_not_replace_complete_latest(tmp_path) -> None:
+    """Test that a deadline-degraded run stays in the history but not in the latest runs."""
+    store = AnalysisStore(str(tmp_path / 'analysis.db'))
+    store.save_run('video1', {**make_result(1, {}), 'partial': True}, channel_id='chan', run_at=500)
+    assert store.latest_per_video()[0]['partial']
+
+    store.save_run('video1', make_result(2, {'audio': 100}), channel_id='chan', run_at=1000)
+    store.save_run('video1', {**make_result(3, {}), 'partial': True, 'degraded_stages': ['topics']},
+                   channel_id='chan', run_at=2000)
+
+    assert [r['sentiment_breakdown']['positive'] for r in store.latest_per_video()] == [2]
+    assert store.top_terms_for_channel('chan') == [{'term': 'audio', 'weight': 100, 'videos': 1}]
+    assert [r['sentiment_breakdown']['positive'] for r in store.video_history('video1')] == [3, 2, 1]
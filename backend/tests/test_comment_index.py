@@ -0,0 +1,94 @@
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.api import app
+from src.storage.comment_index import CommentIndex, CommentIndexStore
+
+# Mock per-comment pipeline results
+TEXTS = ['Love the audio!', 'Bad audio, fix the mic', 'Okay video', 'Great editing 🎬', 'Hate the music']
+SCORES = [0.6, -0.5, 0.0, 0.8, -0.7]
+LABELS = ['POSITIVE', 'NEGATIVE', 'NEUTRAL', 'POSITIVE', 'NEGATIVE']
+TOKENS = [['love', 'audio'], ['bad', 'audio', 'mic'], ['okay', 'video'], ['great', 'editing'], ['hate', 'music']]
+
+def make_index() -> CommentIndex:
+    """Builds a small index with two topics."""
+    return CommentIndex.build(TEXTS, SCORES, LABELS, TOKENS, topics=[0, 0, -1, 1, 1],
+                              topic_terms=[['audio', 'mic'], ['editing', 'music']])
+
+def test_top_n_by_score_with_pagination() -> None:
+    """Test that pages follow the score order in both directions."""
+    index = make_index()
+    first = index.query(order='asc', limit=2)
+    assert first['total'] == 5
+    assert [c['text'] for c in first['comments']] == ['Hate the music', 'Bad audio, fix the mic']
+    assert [c['id'] for c in index.query(order='asc', offset=2, limit=2)['comments']] == [2, 0]
+    assert [c['id'] for c in index.query(order='desc', limit=2)['comments']] == [3, 0]
+    assert [c['id'] for c in index.query(order='desc', offset=4, limit=2)['comments']] == [4]
+    assert index.query(offset=10)['comments'] == []
+
+def test_label_and_term_filters() -> None:
+    """Test that label and term lookups return score-sorted matches."""
+    index = make_index()
+    assert [c['id'] for c in index.query(label='POSITIVE', order='desc')['comments']] == [3, 0]
+    assert [c['id'] for c in index.query(term='audio')['comments']] == [1, 0]
+    assert [c['id'] for c in index.query(term='audio', label='POSITIVE')['comments']] == [0]
+    assert index.query(term='audio', label='NEGATIVE', order='desc') == index.query(term='audio', label='NEGATIVE')
+    assert index.query(term='audio', label='NEUTRAL')['total'] == 0
+    assert index.query(term='unknown') == {'total': 0, 'comments': []}
+
+    comment = index.query(term='editing')['comments'][0]
+    assert comment == {'id': 3, 'text': 'Great editing 🎬', 'score': 0.8, 'label': 'POSITIVE',
+                       'topic': 1, 'topic_terms': ['editing', 'music']}
+    assert index.query(term='okay')['comments'][0]['topic'] is None
+
+def test_store_round_trip(tmp_path) -> None:
+    """Test that an index saved to disk answers the same queries after reloading."""
+    CommentIndexStore(str(tmp_path)).save('video1', make_index())
+
+    reloaded = CommentIndexStore(str(tmp_path)).get('video1')
+    assert reloaded.query(term='audio') == make_index().query(term='audio')
+    assert CommentIndexStore(str(tmp_path)).get('missing') is None
+
+def test_comments_endpoint(tmp_path) -> None:
+    """Test that /comments pages through the latest index of a video."""
+    store = CommentIndexStore(str(tmp_path))
+    store.save('abcdefghijk', make_index())
+
+    with patch('src.api.get_comment_index_store', return_value=store):
+        client = TestClient(app)
+        response = client.get('/comments', params={'videoLink': 'https://youtu.be/abcdefghijk',
+                                                   'label': 'negative', 'limit': 1})
+        assert response.status_code == 200
+        body = response.json()
+        assert body['total'] == 2 and body['next_offset'] == 1
+        assert body['comments'][0]['text'] == 'Hate the music'
+
+        assert client.get('/comments', params={'videoLink': 'https://youtu.be/abcdefghijk',
+                                               'term': 'Audio'}).json()['total'] == 2
+
+        # Inflected query terms are lemmatized like the indexed tokens
+        with patch('src.preprocessing.preprocessing.lemmatizer.lemmatize', side_effect=lambda w: w.rstrip('s')):
+            assert client.get('/comments', params={'videoLink': 'https://youtu.be/abcdefghijk',
+                                                   'term': 'Mics!'}).json()['total'] == 1
+        assert client.get('/comments', params={'videoLink': 'https://youtu.be/zzzzzzzzzzz'}).status_code == 404
+
+        response = client.get('/comments', params={'videoLink': 'https://www.youtube.com/watch?v=a.b'})
+        assert response.status_code == 200
+        assert response.json() == {'status': 'Invalid video link'}
+
+def test_term_label_postings_match_filtering() -> None:
+    """Test that per-(term, label) postings return the same score-sorted pages as filtering."""
+    import random
+    rng = random.Random(0)
+    words = ['audio', 'mic', 'music', 'edit']
+    tokens = [rng.sample(words, 2) for _ in range(300)]
+    scores = [rng.uniform(-1, 1) for _ in range(300)]
+    labels = [rng.choice(['POSITIVE', 'NEGATIVE', 'NEUTRAL']) for _ in range(300)]
+    index = CommentIndex.build([' '.join(t) for t in tokens], scores, labels, tokens)
+
+    for word in words:
+        for label in ('POSITIVE', 'NEGATIVE', 'NEUTRAL', 'MIXED'):
+            expected = sorted((i for i in range(300) if word in tokens[i] and labels[i] == label),
+                              key=lambda i: (scores[i], i))
+            page = index.query(term=word, label=label, offset=3, limit=7)
+            assert page['total'] == len(expected)
+            assert [c['id'] for c in page['comments']] == expected[3:10]
@@ -0,0 +1,65 @@
+import pytest
+from unittest import mock
+from src.extraction.fetch_comments import get_detailed_comments
+from src.utils.deadline import Deadline
+
+MOCK_PAGE = {
+    'items': [{'snippet': {'topLevelComment': {'snippet': {'textDisplay': 'Great video!'}}}}],
+    'nextPageToken': 'next'
+}
+
+def test_deadline_tracks_degraded_stages() -> None:
+    """Test budget accounting and degraded stage bookkeeping."""
+    deadline = Deadline(60)
+    assert not deadline.expired()
+    assert deadline.allows(0.9)
+    assert not deadline.partial
+
+    deadline.degrade('bigrams', 'test')
+    deadline.degrade('bigrams', 'test again')
+    assert deadline.partial
+    assert deadline.degraded_stages == ['bigrams']
+
+def test_expired_deadline() -> None:
+    """Test that a zero budget is immediately expired."""
+    deadline = Deadline(0)
+    assert deadline.expired()
+    assert deadline.fraction_remaining() == 0.0
+    assert not deadline.allows(0.1)
+
+@pytest.mark.asyncio
+async def test_fetch_stops_paginating_when_budget_is_spent() -> None:
+    """Test that the fetcher stops early and flags the fetch stage once the deadline is close."""
+    calls = []
+
+    async def mock_fetch_comments_page(session, video_id, page_token=None):
+        calls.append(page_token)
+        deadline.expires_at -= 60  # simulate a slow page that burns the budget
+        return MOCK_PAGE
+
+    deadline = Deadline(60)
+    with mock.patch('src.extraction.fetch_comments.fetch_comments_page', mock_fetch_comments_page):
+        comments = await get_detailed_comments('mock_video_id', max_results=1000, deadline=deadline)
+
+    assert len(calls) == 1
+    assert len(comments) == 1
+    assert deadline.degraded_stages == ['fetch']
+
+@pytest.mark.asyncio
+async def test_fetch_stops_once_fetch_share_is_spent() -> None:
+    """Test that pagination stops once 40% of the budget is spent, leaving room for bigrams."""
+    calls = []
+
+    async def mock_fetch_comments_page(session, video_id, page_token=None):
+        calls.append(page_token)
+        deadline.expires_at -= 1  # simulate a 1s page
+        return MOCK_PAGE
+
+    deadline = Deadline(10)
+    with mock.patch('src.extraction.fetch_comments.fetch_comments_page', mock_fetch_comments_page):
+        comments = await get_detailed_comments('mock_video_id', max_results=1000, deadline=deadline)
+
+    assert len(calls) == len(comments) == 4
+    assert deadline.fraction_remaining() == pytest.approx(0.6, abs=0.01)
+    assert deadline.allows(0.5)
+    assert deadline.degraded_stages == ['fetch']
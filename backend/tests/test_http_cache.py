@@ -0,0 +1,87 @@
+import json
+import pytest
+from unittest import mock
+from src.extraction import fetch_comments
+from src.extraction.http_cache import HttpPageCache, CacheMissError
+
+MOCK_PARAMS = {'part': 'snippet', 'videoId': 'mock_video_id', 'maxResults': 100, 'key': 'secret'}
+MOCK_BODY = json.dumps({'items': [], 'etag': 'abc'}).encode('utf-8')
+
+class MockResponse:
+    """Minimal stand-in for an aiohttp response."""
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+class MockSession:
+    """Records request headers and answers with a fixed response."""
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append(headers)
+        return self.response
+
+def test_cache_key_ignores_api_key() -> None:
+    """Test that the API key is not part of the cache key."""
+    assert HttpPageCache.make_key(MOCK_PARAMS) == HttpPageCache.make_key({**MOCK_PARAMS, 'key': 'other'})
+    assert HttpPageCache.make_key(MOCK_PARAMS) != HttpPageCache.make_key({**MOCK_PARAMS, 'pageToken': 'p2'})
+
+def test_store_and_load_round_trip(tmp_path) -> None:
+    """Test that bodies and validators survive a compressed round trip."""
+    cache = HttpPageCache(tmp_path)
+    key = cache.make_key(MOCK_PARAMS)
+    cache.store(key, MOCK_PARAMS, MOCK_BODY, {'ETag': '"v1"'})
+
+    entry = cache.load(key)
+    assert entry['body'] == MOCK_BODY
+    assert 'secret' not in json.dumps(entry['params'])
+    assert HttpPageCache.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+
+@pytest.mark.asyncio
+async def test_fetch_revalidates_with_etag(tmp_path) -> None:
+    """Test that a 304 answer is served from the cache."""
+    cache = HttpPageCache(tmp_path)
+    session = MockSession(MockResponse(200, MOCK_BODY, {'ETag': '"v1"'}))
+    with mock.patch.object(fetch_comments, 'page_cache', cache):
+        assert await fetch_comments.fetch_comments_page(session, 'mock_video_id') == json.loads(MOCK_BODY)
+
+        session.response = MockResponse(304)
+        assert await fetch_comments.fetch_comments_page(session, 'mock_video_id') == json.loads(MOCK_BODY)
+        assert session.requests[-1] == {'If-None-Match': '"v1"'}
+
+@pytest.mark.asyncio
+async def test_replay_mode_never_hits_network(tmp_path) -> None:
+    """Test that replay mode serves recorded pages and fails fast on a miss."""
+    HttpPageCache(tmp_path).store(
+        HttpPageCache.make_key({**MOCK_PARAMS, 'textFormat': 'plainText'}), MOCK_PARAMS, MOCK_BODY, {})
+    session = MockSession(None)
+    with mock.patch.object(fetch_comments, 'page_cache', HttpPageCache(tmp_path, mode='replay')):
+        assert await fetch_comments.fetch_comments_page(session, 'mock_video_id') == json.loads(MOCK_BODY)
+        with pytest.raises(CacheMissError):
+            await fetch_comments.fetch_comments_page(session, 'mock_video_id', 'missing_token')
+    assert session.requests == []
+
+@pytest.mark.asyncio
+async def test_replay_miss_on_later_page_fails_the_fetch(tmp_path) -> None:
+    """Test that a replay miss after the first page is raised, not turned into a truncated result."""
+    first_page = json.dumps({
+        'items': [{'snippet': {'topLevelComment': {'snippet': {'textDisplay': 'Great video!'}}}}],
+        'nextPageToken': 'p2',
+    }).encode('utf-8')
+    HttpPageCache(tmp_path).store(
+        HttpPageCache.make_key({**MOCK_PARAMS, 'textFormat': 'plainText'}), MOCK_PARAMS, first_page, {})
+    with mock.patch.object(fetch_comments, 'page_cache', HttpPageCache(tmp_path, mode='replay')):
+        with pytest.raises(CacheMissError):
+            await fetch_comments.get_detailed_comments('mock_video_id', max_results=200, session=MockSession(None))
@@ -0,0 +1,51 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from src.extraction.http_client import PooledHttpClient
+
+SEEN_REQUESTS = []
+
+@pytest_asyncio.fixture
+async def local_server():
+    """Starts a tiny local HTTP server that records requests and yields its URL."""
+    @web.middleware
+    async def record(request, handler):
+        SEEN_REQUESTS.append((request.method, request.path))
+        return await handler(request)
+
+    async def handler(request):
+        return web.json_response({'items': []})
+
+    SEEN_REQUESTS.clear()
+    app = web.Application(middlewares=[record])
+    app.router.add_get('/page', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/page"
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connections(local_server) -> None:
+    """Test that warm-up opens the connection and later requests reuse it."""
+    client = PooledHttpClient()
+    await client.start(warm_up_url=local_server)
+    assert client.started
+    try:
+        for _ in range(3):
+            async with client.session.get(local_server) as response:
+                assert await response.json() == {'items': []}
+        metrics = client.get_metrics()
+        assert metrics['requests'] == 4
+        assert metrics['connections_created'] == 1
+        assert metrics['connections_reused'] == 3
+        assert metrics['reuse_ratio'] == 0.75
+        assert SEEN_REQUESTS[0] == ('HEAD', '/')
+    finally:
+        await client.close()
+    assert not client.started
+
+def test_client_not_started_outside_its_loop() -> None:
+    """Test that the client reports itself unusable without a running loop."""
+    assert not PooledHttpClient().started
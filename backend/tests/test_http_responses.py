@@ -0,0 +1,60 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from src.utils.http_responses import cacheable_json_response, etag_matches, negotiate_encoding
+
+MOCK_RESULT = {'status': 'Success', 'topics': {'positive': {f'word{i}': i for i in range(100)}}}
+
+app = FastAPI()
+
+@app.get('/result')
+async def result(request: Request, cacheable: bool = True):
+    return cacheable_json_response(request, MOCK_RESULT, cacheable=cacheable)
+
+client = TestClient(app)
+
+def test_gzip_response_with_etag() -> None:
+    """Test that large results are gzip-compressed and carry validators."""
+    response = client.get('/result', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['etag'].endswith('-gzip"')
+    assert response.headers['cache-control'].startswith('public, max-age=')
+    assert response.json() == MOCK_RESULT
+
+def test_if_none_match_returns_304() -> None:
+    """Test revalidation with the ETag of any encoding of the same result."""
+    etag = client.get('/result', headers={'Accept-Encoding': 'gzip'}).headers['etag']
+    response = client.get('/result', headers={'If-None-Match': etag, 'Accept-Encoding': 'identity'})
+    assert response.status_code == 304
+    assert response.content == b''
+
+def test_304_carries_the_representation_etag() -> None:
+    """Test that a 304 repeats the ETag of the 200 the same client would have received."""
+    for encoding in ('gzip', 'identity'):
+        etag = client.get('/result', headers={'Accept-Encoding': encoding}).headers['etag']
+        response = client.get('/result', headers={'If-None-Match': etag, 'Accept-Encoding': encoding})
+        assert response.status_code == 304
+        assert response.headers['etag'] == etag
+
+def test_non_cacheable_result() -> None:
+    """Test that partial results are not stored by shared caches."""
+    response = client.get('/result', params={'cacheable': False}, headers={'Accept-Encoding': 'identity'})
+    assert response.headers['cache-control'] == 'no-cache'
+    assert 'content-encoding' not in response.headers
+
+@pytest.mark.parametrize("header, expected", [
+    ('gzip, deflate', 'gzip'),
+    ('identity', None),
+    ('gzip;q=0', None),
+    ('', None),
+])
+def test_negotiate_encoding(header: str, expected: str) -> None:
+    """Test Accept-Encoding negotiation for gzip."""
+    assert negotiate_encoding(header) == expected
+
+def test_etag_matches() -> None:
+    """Test If-None-Match parsing."""
+    assert etag_matches('W/"abc-gzip", "other"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
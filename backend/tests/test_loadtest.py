@@ -0,0 +1,60 @@
+import os
+import random
+from loadtest.fake_youtube import build_page, parse_video_size
+from loadtest.run_loadtest import SCENARIO_DEFAULTS, percentile, pick_video
+
+def test_fake_youtube_paginates_by_video_size() -> None:
+    """Test that fake videos expose as many comments as their ID says, 100 per page."""
+    assert parse_video_size('lt_250_0') == 250
+    first, last = build_page('lt_250_0', 0), build_page('lt_250_0', 200)
+    assert len(first['items']) == 100 and first['nextPageToken'] == '100'
+    assert len(last['items']) == 50 and 'nextPageToken' not in last
+    assert build_page('lt_250_0', 0) == first  # deterministic
+
+def test_pick_video_honours_repeat_ratio() -> None:
+    """Test that repeat_ratio=1 only re-requests already seen videos."""
+    rng = random.Random(0)
+    scenario = {**SCENARIO_DEFAULTS, 'repeat_ratio': 1.0}
+    requested = []
+    first = pick_video(rng, scenario, requested)
+    assert all(pick_video(rng, scenario, requested) == first for _ in range(10))
+
+def test_percentile() -> None:
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0.0
+
+def test_comment_cap_covers_largest_video() -> None:
+    """Test that the app's comment cap is raised to the largest video size unless set explicitly."""
+    from loadtest.run_loadtest import comment_cap
+
+    scenario = {**SCENARIO_DEFAULTS, 'video_sizes': {'150': 0.5, '10000': 0.5}}
+    assert comment_cap(scenario) == 10000
+    assert comment_cap({**scenario, 'max_comments': 500}) == 500
+
+def test_scenario_environment_is_restored(monkeypatch) -> None:
+    """Test that in-process runs do not leak environment changes into the importing process."""
+    from loadtest.run_loadtest import scenario_environment
+
+    monkeypatch.setenv('ANALYSIS_DB_PATH', '/real/analysis.db')
+    monkeypatch.delenv('COMMENT_INDEX_DIR', raising=False)
+    with scenario_environment({'ANALYSIS_DB_PATH': '/tmp/lt/analysis.db', 'COMMENT_INDEX_DIR': '/tmp/lt/index'}):
+        assert os.environ['COMMENT_INDEX_DIR'] == '/tmp/lt/index'
+    assert os.environ['ANALYSIS_DB_PATH'] == '/real/analysis.db'
+    assert 'COMMENT_INDEX_DIR' not in os.environ
+
+def test_isolated_stores_use_temporary_databases(tmp_path) -> None:
+    """Test that load-test analyses are stored in the temporary directory, not the shared stores."""
+    from loadtest.run_loadtest import isolated_stores
+    from src.storage.analysis_store import get_analysis_store
+    from src.storage.comment_index import get_comment_index_store
+    from src.trends.rollups import get_rollup_store
+
+    before = get_analysis_store()
+    with isolated_stores(str(tmp_path)):
+        assert get_analysis_store().db_path == str(tmp_path / 'analysis.db')
+        assert get_rollup_store().db_path == str(tmp_path / 'analysis.db')
+        assert get_comment_index_store().index_dir == tmp_path / 'comment_index'
+    assert get_analysis_store() is before
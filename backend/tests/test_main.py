@@ -1,5 +1,6 @@
 import asyncio
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, AsyncMock
 from src.main import run_etl_pipeline
@@ -49,3 +50,177 @@ def test_etl_pipeline_csv(mock_preprocess, mock_get_comments) -> None:
     assert CSV_FILE.exists()
     df = pd.read_csv(CSV_FILE)
     assert 'great video' in df['text'].values
+
+def test_extract_words_from_topics_uses_topic_term_matrix() -> None:
+    """Test topic word extraction directly from a topic-term matrix."""
+    from gensim import corpora
+    from src.main import build_vocabulary_masks, extract_words_from_topics
+
+    dictionary = corpora.Dictionary([["audio", "like", "mr_beast", "great"]])
+    masks = build_vocabulary_masks(dictionary)
+    matrix = np.zeros((2, len(dictionary)))
+    matrix[0, dictionary.token2id["audio"]] = 0.5
+    matrix[0, dictionary.token2id["like"]] = 0.3
+    matrix[1, dictionary.token2id["mr_beast"]] = 0.2
+
+    topics = extract_words_from_topics(matrix, masks, max_words=2)
+    assert topics["positive"] == {"audio": 5000}  # 'like' is a custom stopword
+    assert topics["negative"] == {"mrbeast": 2000}  # synonyms are unified
+    assert topics["neutral"] == {} and topics["mixed"] == {}
+
+def test_generate_content_suggestions_from_top_terms() -> None:
+    """Test that suggestions only fire for keywords among each topic's top terms."""
+    from gensim import corpora
+    from src.main import build_vocabulary_masks, generate_content_suggestions, SUGGESTIONS_MAP
+
+    dictionary = corpora.Dictionary([["audio", "funny", "video"]])
+    masks = build_vocabulary_masks(dictionary)
+    matrix = np.array([[0.0, 0.0, 0.0]])
+    matrix[0, dictionary.token2id["audio"]] = 0.6
+    matrix[0, dictionary.token2id["video"]] = 0.3
+    matrix[0, dictionary.token2id["funny"]] = 0.1
+
+    assert generate_content_suggestions(matrix, masks, topn=2) == [SUGGESTIONS_MAP["audio"]]
+
+@patch('src.main.http_client.start', new_callable=AsyncMock)
+@patch('src.main.run_etl_pipeline', new_callable=AsyncMock)
+def test_lambda_batch_reports_per_record_failures(mock_pipeline, mock_client_start) -> None:
+    """Test that batch events are processed per record and only errored records are retried."""
+    from src.main import lambda_handler
+
+    async def fake_pipeline(video_id, **kwargs):
+        if video_id == 'broken':
+            return {'status': 'Error', 'message': 'boom'}
+        return {'status': 'Success'}
+    mock_pipeline.side_effect = fake_pipeline
+
+    event = {'Records': [
+        {'messageId': 'm1', 'body': '{"videoId": "good"}'},
+        {'messageId': 'm2', 'body': 'https://youtu.be/broken'},
+        {'messageId': 'm3', 'body': 'not a link'},
+    ]}
+    response = lambda_handler(event, None)
+
+    assert [r['status'] for r in response['results']] == ['Success', 'Error', 'Invalid video link']
+    assert response['batchItemFailures'] == [{'itemIdentifier': 'm2'}]
+    assert mock_pipeline.await_count == 2
+    mock_client_start.assert_awaited()
+
+@patch('src.main.get_detailed_comments', new_callable=AsyncMock)
+def test_pipeline_flags_empty_fetch_cut_by_deadline(mock_get_comments) -> None:
+    """Test that an early return after a deadline-truncated fetch keeps the partial flags."""
+    from src.utils.deadline import Deadline
+
+    async def fake_fetch(video_id, deadline=None, **kwargs):
+        deadline.degrade('fetch', 'stopped after 0 comments')
+        return []
+    mock_get_comments.side_effect = fake_fetch
+
+    result = asyncio.run(run_etl_pipeline('mock_video_id', deadline=Deadline(0)))
+    assert result == {'status': 'No comments found', 'partial': True, 'degraded_stages': ['fetch']}
+
+@patch('src.main.http_client.start', new_callable=AsyncMock)
+@patch('src.main.run_etl_pipeline', new_callable=AsyncMock)
+def test_lambda_batch_retries_records_without_time(mock_pipeline, mock_client_start) -> None:
+    """Test that records started too close to the timeout, or cut short with no data, are retried."""
+    from unittest.mock import Mock
+    from src.main import lambda_handler
+
+    context = Mock(get_remaining_time_in_millis=Mock(return_value=1500))
+    response = lambda_handler({'videoIds': ['abc', 'def']}, context)
+    assert [r['status'] for r in response['results']] == ['Deferred', 'Deferred']
+    assert response['batchItemFailures'] == [{'itemIdentifier': 'abc'}, {'itemIdentifier': 'def'}]
+    mock_pipeline.assert_not_awaited()
+
+    mock_pipeline.side_effect = [
+        {'status': 'No comments found', 'partial': True, 'degraded_stages': ['fetch']},
+        {'status': 'No comments found', 'partial': False, 'degraded_stages': []},
+    ]
+    response = lambda_handler({'videoIds': ['abc', 'def']}, None)
+    assert response['batchItemFailures'] == [{'itemIdentifier': 'abc'}]
+
+@patch('src.main.get_detailed_comments', new_callable=AsyncMock, return_value=[])
+def test_pipeline_passes_comment_cap_to_fetcher(mock_get_comments) -> None:
+    """Test that the per-video comment cap defaults to MAX_COMMENTS and can be overridden per run."""
+    from src.main import MAX_COMMENTS
+
+    asyncio.run(run_etl_pipeline('mock_video_id'))
+    assert mock_get_comments.await_args.kwargs['max_results'] == MAX_COMMENTS
+
+    asyncio.run(run_etl_pipeline('mock_video_id', max_comments=1000))
+    assert mock_get_comments.await_args.kwargs['max_results'] == 1000
+
+@patch('src.main.analyze_sentiment')
+@patch('src.main.preprocess_comments')
+@patch('src.main.get_detailed_comments', new_callable=AsyncMock, return_value=[{'text': 'Great video!'}])
+def test_pipeline_stops_when_cpu_stage_exhausts_deadline(mock_get_comments, mock_preprocess, mock_sentiment) -> None:
+    """Test that preprocessing runs off the event loop and an expired deadline ends the run right after it."""
+    import threading
+    from src.utils.deadline import Deadline
+
+    deadline = Deadline(60)
+    loop_thread = threading.current_thread()
+
+    def slow_preprocess(comments, use_bigrams=True):
+        assert threading.current_thread() is not loop_thread
+        deadline.expires_at -= 60  # simulate preprocessing that burns the whole budget
+        return pd.DataFrame({'text': ['Great video!'], 'clean_text': ['great video']})
+    mock_preprocess.side_effect = slow_preprocess
+
+    result = asyncio.run(run_etl_pipeline('mock_video_id', deadline=deadline))
+    assert result['status'] == 'Deadline exceeded'
+    assert result['partial'] is True
+    assert result['degraded_stages'] == ['sentiment']
+    mock_sentiment.assert_not_called()
+
+@patch('src.main.get_comment_index_store')
+@patch('src.main.get_analysis_store')
+@patch('src.main._fit_topic_model')
+@patch('src.main.analyze_sentiment')
+@patch('src.main.preprocess_comments')
+@patch('src.main.get_detailed_comments', new_callable=AsyncMock, return_value=[{'text': 'Great video!'}])
+def test_pipeline_skips_topics_when_sentiment_exhausts_deadline(mock_get_comments, mock_preprocess, mock_sentiment,
+                                                                mock_fit_topics, mock_analysis_store,
+                                                                mock_index_store) -> None:
+    """Test that an expired deadline after sentiment returns the sentiment breakdown without topics."""
+    from src.utils.deadline import Deadline
+
+    deadline = Deadline(60)
+    mock_preprocess.return_value = pd.DataFrame({'text': ['Great video!'], 'clean_text': ['great video']})
+
+    def slow_sentiment(texts):
+        deadline.expires_at -= 60  # simulate sentiment scoring that burns the whole budget
+        return [{'sentiment': 'POSITIVE', 'sentiment_score': {'compound': 0.6}}]
+    mock_sentiment.side_effect = slow_sentiment
+
+    result = asyncio.run(run_etl_pipeline('mock_video_id', deadline=deadline))
+    assert result['status'] == 'Success'
+    assert result['sentiment_breakdown']['positive'] == 1
+    assert result['partial'] is True
+    assert 'topics' in result['degraded_stages']
+    mock_fit_topics.assert_not_called()
+
+@patch('src.main.http_client.start', new_callable=AsyncMock)
+@patch('src.main.preprocess_comments')
+@patch('src.main.get_detailed_comments', new_callable=AsyncMock)
+def test_lambda_batch_overlaps_fetch_with_cpu_stages(mock_get_comments, mock_preprocess, mock_client_start) -> None:
+    """Test that one record's fetch proceeds while another record is still preprocessing."""
+    import threading
+    from src.main import lambda_handler
+
+    second_fetched = threading.Event()
+
+    async def fake_fetch(video_id, **kwargs):
+        if video_id == 'def':
+            second_fetched.set()
+        return [{'text': video_id}]
+    mock_get_comments.side_effect = fake_fetch
+
+    def blocking_preprocess(comments, use_bigrams=True):
+        if comments[0]['text'] == 'abc':
+            assert second_fetched.wait(timeout=5), 'preprocessing blocked the event loop'
+        return pd.DataFrame()
+    mock_preprocess.side_effect = blocking_preprocess
+
+    response = lambda_handler({'videoIds': ['abc', 'def']}, None)
+    assert [r['status'] for r in response['results']] == ['No valid comments to preprocess'] * 2
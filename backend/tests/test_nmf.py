@@ -0,0 +1,63 @@
+import numpy as np
+from gensim import corpora
+from src.topic_modeling.nmf import bow_to_tfidf_matrix, nmf, fit_nmf_topics
+from src.main import build_vocabulary_masks, extract_words_from_topics
+
+# Two clearly separated mock topics
+MOCK_DOCS = [['audio', 'mic', 'sound']] * 5 + [['editing', 'cuts', 'transitions']] * 5
+
+def test_tfidf_matrix_shape_and_norm() -> None:
+    """Test that the TF-IDF matrix is sparse, correctly shaped and L2-normalized per row."""
+    dictionary = corpora.Dictionary(MOCK_DOCS + [[]])
+    corpus = [dictionary.doc2bow(doc) for doc in MOCK_DOCS + [[]]]
+    matrix = bow_to_tfidf_matrix(corpus, len(dictionary))
+
+    assert matrix.shape == (11, len(dictionary))
+    assert matrix.nnz == 30
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A.ravel()
+    assert np.allclose(norms[:10], 1.0) and norms[10] == 0
+
+def test_nmf_separates_planted_topics() -> None:
+    """Test that NMF recovers two disjoint topics and is deterministic."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    corpus = [dictionary.doc2bow(doc) for doc in MOCK_DOCS]
+    topics = fit_nmf_topics(corpus, len(dictionary), num_topics=2, max_iter=100)
+
+    assert topics.shape == (2, len(dictionary))
+    assert np.allclose(topics.sum(axis=1), 1.0)
+    assert np.array_equal(topics, fit_nmf_topics(corpus, len(dictionary), num_topics=2, max_iter=100))
+
+    top_words = {frozenset(dictionary[i] for i in np.argsort(row)[-3:]) for row in topics}
+    assert top_words == {frozenset(['audio', 'mic', 'sound']), frozenset(['editing', 'cuts', 'transitions'])}
+
+def test_nmf_output_feeds_word_extraction() -> None:
+    """Test that the NMF topic-term matrix plugs into extract_words_from_topics like LDA's."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    corpus = [dictionary.doc2bow(doc) for doc in MOCK_DOCS]
+    topics = fit_nmf_topics(corpus, len(dictionary), num_topics=2, max_iter=50)
+
+    topics_dict = extract_words_from_topics(topics, build_vocabulary_masks(dictionary), max_words=3)
+    assert set(topics_dict) == {'positive', 'negative', 'neutral', 'mixed'}
+    assert set(topics_dict['positive']) | set(topics_dict['negative']) == set(dictionary.token2id)
+    assert all(weight >= 10 for words in topics_dict.values() for weight in words.values())
+
+def test_nmf_reduces_reconstruction_error() -> None:
+    """Test that more multiplicative updates do not increase the reconstruction error."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    matrix = bow_to_tfidf_matrix([dictionary.doc2bow(doc) for doc in MOCK_DOCS], len(dictionary))
+    errors = []
+    for max_iter in (1, 10, 100):
+        W, H = nmf(matrix, 2, max_iter=max_iter)
+        errors.append(np.linalg.norm(matrix.toarray() - W @ H))
+    assert errors[0] >= errors[1] >= errors[2]
+
+def test_benchmark_reports_both_backends() -> None:
+    """Test that the topic backend benchmark times and scores LDA and NMF."""
+    from benchmarks.topic_backends import run_benchmark, synthetic_corpus
+
+    report = run_benchmark(synthetic_corpus(200), repeats=1)
+    for backend in ('lda', 'nmf'):
+        assert report[backend]['median_seconds'] > 0
+        assert len(report[backend]['topics']) == 10
+        assert np.isfinite(report[backend]['u_mass_coherence'])
+    assert report['corpus']['documents'] == 200
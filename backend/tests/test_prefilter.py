@@ -0,0 +1,33 @@
+from src.preprocessing.preprocessing import prefilter_comments
+
+# Mock comments covering every prefilter category
+MOCK_COMMENTS = [
+    {'text': 'Great video!'},
+    {'text': '2:35 best part lol'},
+    {'text': ''},
+    {'text': None},
+    {'text': 'https://example.com/watch'},
+    {'text': '1:23 4:56:07'},
+    {'text': 'Отличное видео'},
+    {'text': '素晴らしい'},
+    {'text': '😂😂🔥'},
+    {'text': '100%!!!'},
+]
+
+def test_prefilter_comments() -> None:
+    """Test that non-informative comments are dropped and counted per category."""
+    kept, dropped = prefilter_comments(MOCK_COMMENTS)
+    assert [c['text'] for c in kept] == ['Great video!', '2:35 best part lol']
+    assert dropped == {
+        'empty': 2,
+        'link_only': 1,
+        'timestamp_only': 1,
+        'non_latin': 2,
+        'emoji_only': 2,
+    }
+
+def test_prefilter_no_comments() -> None:
+    """Test prefiltering an empty batch."""
+    kept, dropped = prefilter_comments([])
+    assert kept == []
+    assert sum(dropped.values()) == 0
@@ -0,0 +1,39 @@
+import time
+from src.utils.profiling import RequestProfiler, mark_stage
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_profiler_writes_stage_annotated_flame_graph(tmp_path) -> None:
+    """Test that samples are grouped by pipeline stage and written as collapsed stacks."""
+    with RequestProfiler('mock_video_id', output_dir=tmp_path, interval=0.001) as profiler:
+        mark_stage('fetch')
+        busy_wait(0.05)
+        mark_stage('topics')
+        busy_wait(0.05)
+
+    folded = open(profiler.output_files['folded'], encoding='utf-8').read().splitlines()
+    assert folded
+    assert all(line.startswith('stage:') and line.rsplit(' ', 1)[1].isdigit() for line in folded)
+    assert any(line.startswith('stage:topics;') and 'busy_wait' in line for line in folded)
+
+    summary = open(profiler.output_files['summary'], encoding='utf-8').read()
+    assert 'Top functions by self samples' in summary
+    assert 'fetch' in summary and 'topics' in summary
+
+def test_mark_stage_without_profiler() -> None:
+    """Test that stage marks are no-ops when profiling is off."""
+    mark_stage('fetch')
+
+def test_unsafe_label_stays_in_output_dir(tmp_path) -> None:
+    """Test that a path-like video ID cannot write outside the output directory."""
+    output_dir = tmp_path / 'profiles'
+    with RequestProfiler('../../x', output_dir=output_dir, interval=0.001) as profiler:
+        busy_wait(0.01)
+
+    written = list(tmp_path.rglob('*.folded'))
+    assert len(written) == 1 and written[0].parent == output_dir
+    assert profiler.file_names()['folded'] == written[0].name
+    assert '/' not in profiler.file_names()['summary']
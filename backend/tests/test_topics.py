@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from gensim import corpora, models
+from src.api import app
+from src.main import run_etl_pipeline
+from src.topic_modeling.nmf import fit_nmf_topics
+from src.topic_modeling.topics import NO_TOPIC, assign_topics, assign_lda_topics
+
+# Two clearly separated mock topics
+MOCK_DOCS = [['audio', 'mic', 'sound']] * 5 + [['editing', 'cuts', 'transitions']] * 5
+
+def test_assign_topics_picks_dominant_topic() -> None:
+    """Test that documents are assigned the topic matching their terms, and NO_TOPIC when empty."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    corpus = [dictionary.doc2bow(doc) for doc in MOCK_DOCS] + [[]]
+    topics = fit_nmf_topics(corpus[:-1], len(dictionary), num_topics=2, max_iter=100)
+
+    assignments = assign_topics(corpus, topics)
+    assert assignments[-1] == NO_TOPIC
+    assert len(set(assignments[:5])) == 1 and len(set(assignments[5:10])) == 1
+    assert assignments[0] != assignments[5]
+
+def test_lda_topics_come_from_model_inference() -> None:
+    """Test that LDA comments get the model's most probable topic, and NO_TOPIC when empty."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    corpus = [dictionary.doc2bow(doc) for doc in MOCK_DOCS] + [[]]
+    lda_model = models.LdaModel(corpus=corpus[:-1], num_topics=2, id2word=dictionary, passes=10, random_state=42)
+
+    assignments = assign_lda_topics(lda_model, corpus)
+    expected = [max(lda_model.get_document_topics(doc, minimum_probability=0), key=lambda t: t[1])[0]
+                for doc in corpus[:-1]]
+    assert assignments[:-1].tolist() == expected
+    assert assignments[-1] == NO_TOPIC
+
+def test_lda_topics_of_empty_corpus() -> None:
+    """Test that an empty corpus yields no assignments."""
+    dictionary = corpora.Dictionary(MOCK_DOCS)
+    lda_model = models.LdaModel(corpus=[dictionary.doc2bow(doc) for doc in MOCK_DOCS], num_topics=2,
+                                id2word=dictionary, random_state=42)
+    assert assign_lda_topics(lda_model, []).shape == (0,)
+
+def test_unknown_topic_backend_is_rejected() -> None:
+    """Test that the pipeline and /run-etl reject an unknown topic backend."""
+    with pytest.raises(ValueError):
+        asyncio.run(run_etl_pipeline('mock_video_id', topic_backend='lad'))
+
+    response = TestClient(app).get('/run-etl', params={'videoLink': 'https://youtu.be/abcdefghijk',
+                                                       'topicBackend': 'lad'})
+    assert response.status_code == 400
@@ -0,0 +1,64 @@
+import pytest
+from src.trends.rollups import TrendRollupStore
+
+# Mock analyzed comments: (comment_id, published_at, likes, label, compound score)
+MOCK_BATCH = [
+    ('c1', '2024-01-01T10:05:00Z', 0, 'POSITIVE', 0.8),
+    ('c2', '2024-01-01T10:45:00Z', 3, 'NEGATIVE', -0.5),
+    ('c3', '2024-01-01T11:10:00Z', 1, 'NEUTRAL', 0.0),
+]
+
+@pytest.fixture
+def store(tmp_path) -> TrendRollupStore:
+    """Rollup store backed by a temporary database."""
+    return TrendRollupStore(str(tmp_path / 'analysis.db'))
+
+def ingest(store: TrendRollupStore, batch) -> int:
+    comment_ids, published_at, likes, labels, scores = zip(*batch)
+    return store.ingest('mock_video_id', comment_ids, published_at, likes, labels, scores)
+
+def test_hourly_and_daily_rollups(store) -> None:
+    """Test that comments are bucketed per hour and per day with like-weighted scores."""
+    assert ingest(store, MOCK_BATCH) == 3
+
+    hourly = store.get_trend('mock_video_id', 'hour')
+    assert [b['bucket_start'] for b in hourly] == ['2024-01-01T10:00:00+00:00', '2024-01-01T11:00:00+00:00']
+    assert hourly[0]['counts'] == {'positive': 1, 'negative': 1, 'neutral': 0, 'mixed': 0}
+    # (0.8 * 1 + -0.5 * 4) / 5
+    assert hourly[0]['like_weighted_score'] == pytest.approx(-0.24)
+
+    daily = store.get_trend('mock_video_id', 'day')
+    assert len(daily) == 1
+    assert daily[0]['total'] == 3
+
+def test_incremental_ingest_skips_already_seen_comments(store) -> None:
+    """Test that re-ingesting overlapping comments only adds the new ones."""
+    ingest(store, MOCK_BATCH)
+
+    new_comment = ('c4', '2024-01-01T11:30:00Z', 0, 'POSITIVE', 0.6)
+    assert ingest(store, MOCK_BATCH + [new_comment]) == 1
+
+    hourly = store.get_trend('mock_video_id', 'hour')
+    assert hourly[1]['counts'] == {'positive': 1, 'negative': 0, 'neutral': 1, 'mixed': 0}
+
+def test_older_and_same_second_comments_are_not_dropped(store) -> None:
+    """Test that dedup is by comment ID, so older comments from a later page and ties are still counted."""
+    ingest(store, MOCK_BATCH[2:])  # newest-first fetch truncated after one comment
+
+    same_second = ('c5', '2024-01-01T11:10:00Z', 0, 'NEGATIVE', -0.3)
+    assert ingest(store, MOCK_BATCH + [same_second]) == 3
+    assert sum(b['total'] for b in store.get_trend('mock_video_id', 'day')) == 4
+
+def test_rollups_persist_across_instances(tmp_path) -> None:
+    """Test that buckets and seen comment IDs survive a restart."""
+    db_path = str(tmp_path / 'analysis.db')
+    ingest(TrendRollupStore(db_path), MOCK_BATCH)
+
+    reopened = TrendRollupStore(db_path)
+    assert ingest(reopened, MOCK_BATCH) == 0
+    assert reopened.get_trend('mock_video_id', 'day')[0]['total'] == 3
+
+def test_unknown_granularity(store) -> None:
+    """Test that unsupported bucket sizes are rejected."""
+    with pytest.raises(ValueError):
+        store.get_trend('mock_video_id', 'week')
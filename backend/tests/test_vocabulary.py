@@ -0,0 +1,39 @@
+import random
+from gensim import corpora
+from src.preprocessing.vocabulary import StreamingVocabulary, build_vocabulary
+
+# Mock tokenized comments
+MOCK_DOCS = [
+    ['great', 'video', 'audio'],
+    ['great', 'audio', 'music'],
+    ['bad', 'audio', 'mic'],
+    ['music', 'great', 'editing'],
+    ['funny', 'video'],
+    ['tutorial', 'great'],
+]
+
+def test_matches_filter_extremes_when_exact() -> None:
+    """Test that an unsaturated sketch yields the same vocabulary as Dictionary.filter_extremes()."""
+    expected = corpora.Dictionary(MOCK_DOCS)
+    expected.filter_extremes(no_below=2, no_above=0.5, keep_n=10000)
+
+    dictionary, report = build_vocabulary(MOCK_DOCS, no_below=2, no_above=0.5, batch_size=2)
+    assert set(dictionary.token2id) == set(expected.token2id)
+    assert report['exact'] and report['max_overestimate'] == 0
+    assert dictionary.doc2bow(['audio', 'audio', 'unknown']) == [(dictionary.token2id['audio'], 2)]
+
+def test_bounded_capacity_keeps_heavy_hitters() -> None:
+    """Test that a small sketch still finds the most frequent terms and reports its error."""
+    rng = random.Random(0)
+    heavy = ['great', 'video', 'audio', 'music', 'funny']
+    docs = [rng.sample(heavy, 2) + [f'rare{rng.randint(0, 5000)}' for _ in range(3)] for _ in range(2000)]
+
+    vocabulary = StreamingVocabulary(capacity=50)
+    for start in range(0, len(docs), 100):
+        vocabulary.add_documents(docs[start:start + 100])
+    dictionary, report = vocabulary.to_dictionary(no_below=2, no_above=1.0, keep_n=5)
+
+    assert len(vocabulary.counts) <= 50
+    assert set(dictionary.token2id) == set(heavy)
+    assert not report['exact'] and report['evictions'] > 0
+    assert report['uncertain_terms'] == 0